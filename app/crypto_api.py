@@ -5,6 +5,10 @@ import os
 import requests
 from fastapi import HTTPException
 
+from .metrics import UPSTREAM_ERRORS, UPSTREAM_LATENCY, timed
+
+CRYPTO_PANIC_API_URL = "https://cryptopanic.com/api/developer/v2/posts/"
+
 
 def fetch_crypto_news(filter_type: str = "hot", currencies: str = "BTC,ETH", kind: str = "news") -> list:
     """Fetch news from Crypto Panic API"""
@@ -13,7 +17,8 @@ def fetch_crypto_news(filter_type: str = "hot", currencies: str = "BTC,ETH", kin
         raise HTTPException(status_code=400, detail="CRYPTO_PANIC_API_KEY not set in .env file")
     
     # API request
-    url = "https://cryptopanic.com/api/developer/v2/posts/"
+    # Overridable so benchmarks can point ingestion at a local stub server.
+    url = os.getenv("CRYPTO_PANIC_API_URL", CRYPTO_PANIC_API_URL)
     params = {
         'auth_token': api_key,
         'public': 'true',
@@ -23,7 +28,8 @@ def fetch_crypto_news(filter_type: str = "hot", currencies: str = "BTC,ETH", kin
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        with timed(UPSTREAM_LATENCY, "cryptopanic"):
+            response = requests.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -32,6 +38,7 @@ def fetch_crypto_news(filter_type: str = "hot", currencies: str = "BTC,ETH", kin
         return results
         
     except requests.exceptions.RequestException as e:
+        UPSTREAM_ERRORS.labels("cryptopanic").inc()
         raise HTTPException(status_code=500, detail=f"API Error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
\ No newline at end of file
@@ -2,11 +2,38 @@
 Database operations for Crypto News API
 """
 import os
-import psycopg2
-import psycopg2.extras
+import threading
+import time
+from contextlib import contextmanager
 from typing import List, Optional
+
+import orjson
+import psycopg2
+import psycopg2.pool
 from fastapi import HTTPException
 
+from .metrics import DB_POOL_CONNECTIONS, DB_POOL_WAIT, DB_QUERY_LATENCY, INGEST_ITEMS, STREAM_EVENTS, timed
+
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+# Seconds to wait for a free pool connection before giving up with PoolTimeout.
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises when exhausted; the semaphore makes callers wait instead.
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+_pool_in_use = 0
+
+# LISTEN/NOTIFY channel carrying newly inserted news items to every app worker.
+NEWS_CHANNEL = "news_items"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+_NOTIFY_LIMIT = 7900
+
+class PoolTimeout(Exception):
+    """No pooled connection became free within DB_POOL_TIMEOUT seconds"""
+
 
 def get_db_connection():
     """Get database connection using environment variables"""
@@ -16,113 +43,322 @@ def get_db_connection():
         dbname=os.getenv("POSTGRES_DB", "crypto_news"),
         user=os.getenv("POSTGRES_USER", "crypto_user"),
         password=os.getenv("POSTGRES_PASSWORD", "crypto_password"),
+        connect_timeout=DB_CONNECT_TIMEOUT,
     )
 
 
+def _get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    """Create the shared connection pool on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    DB_POOL_MIN,
+                    DB_POOL_MAX,
+                    host=os.getenv("POSTGRES_HOST", "postgres"),
+                    port=os.getenv("POSTGRES_PORT", 5432),
+                    dbname=os.getenv("POSTGRES_DB", "crypto_news"),
+                    user=os.getenv("POSTGRES_USER", "crypto_user"),
+                    password=os.getenv("POSTGRES_PASSWORD", "crypto_password"),
+                    connect_timeout=DB_CONNECT_TIMEOUT,
+                )
+                DB_POOL_CONNECTIONS.labels("max").set(DB_POOL_MAX)
+    return _pool
+
+
+def pool_stats() -> dict:
+    """Return current pool usage (in_use/max)"""
+    return {"in_use": _pool_in_use, "max": DB_POOL_MAX}
+
+
+def _track_in_use(delta: int) -> None:
+    global _pool_in_use
+    with _pool_lock:
+        _pool_in_use += delta
+        DB_POOL_CONNECTIONS.labels("in_use").set(_pool_in_use)
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Borrow a connection from the shared pool and return it afterwards.
+    Connections that errored are discarded instead of being handed back out.
+    Raises PoolTimeout when every connection stays busy for DB_POOL_TIMEOUT seconds.
+    """
+    pool = _get_pool()
+    wait_start = time.perf_counter()
+    if not _pool_slots.acquire(timeout=DB_POOL_TIMEOUT):
+        DB_POOL_WAIT.observe(time.perf_counter() - wait_start)
+        raise PoolTimeout(f"no database connection free after {DB_POOL_TIMEOUT:g}s")
+    try:
+        conn = pool.getconn()
+    except Exception:
+        _pool_slots.release()
+        raise
+    DB_POOL_WAIT.observe(time.perf_counter() - wait_start)
+    _track_in_use(1)
+    broken = False
+    try:
+        yield conn
+    except Exception:
+        broken = conn.closed != 0
+        if not broken:
+            conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn, close=broken)
+        _track_in_use(-1)
+        _pool_slots.release()
+
+
 def save_to_database(results: List[dict]) -> bool:
-    """Save news items to PostgreSQL database using direct connection"""
+    """Save news items to PostgreSQL database using a pooled connection"""
     try:
-        print("🔄 Saving data to database via direct connection...")
-        
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        items_saved = 0
-        for item in results:
-            try:
-                # Use parameterized query to prevent SQL injection
-                sql = """
-                INSERT INTO news_items (
-                    external_id, slug, title, description, 
-                    published_at, created_at, kind
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (external_id) DO NOTHING;
-                """
-                
-                values = (
-                    item.get('id'),
-                    item.get('slug', ''),
-                    item.get('title', ''),
-                    item.get('description', ''),
-                    item.get('published_at', ''),
-                    item.get('created_at', ''),
-                    item.get('kind', '')
-                )
-                
-                cur.execute(sql, values)
-                if cur.rowcount > 0:
-                    items_saved += 1
-                    
-            except Exception as e:
-                print(f"❌ Error inserting item {item.get('id')}: {e}")
-                continue
-        
-        conn.commit()
-        cur.close()
-        conn.close()
-        
+        print("🔄 Saving data to database via pooled connection...")
+        INGEST_ITEMS.labels("fetched").inc(len(results))
+
+        with pooled_connection() as conn, timed(DB_QUERY_LATENCY, "save_news"):
+            items_saved = _insert_news_items(conn, results)
+
         print(f"✅ Successfully saved {items_saved}/{len(results)} news items to database")
         return True
-        
+
     except Exception as e:
         print(f"❌ Database connection error: {e}")
         return False
 
 
-def get_news_from_database(start: Optional[str] = None, end: Optional[str] = None) -> List[dict]:
+def currency_codes(item: dict) -> List[str]:
+    """Return the upper-cased currency codes CryptoPanic attached to a post"""
+    # v2 posts carry "instruments", v1 posts carried "currencies"; both are lists of {"code": ...}.
+    entries = item.get("instruments") or item.get("currencies") or []
+    codes = []
+    for entry in entries:
+        code = entry.get("code") if isinstance(entry, dict) else entry
+        # assets.code is VARCHAR(20); anything longer is not a ticker.
+        if code and len(code) <= 20 and code.upper() not in codes:
+            codes.append(code.upper())
+    return codes
+
+
+def ensure_assets(conn, codes) -> None:
     """
-    Fetch news items from PostgreSQL using psycopg2.
-    Optionally filter by published_at between start and end (ISO8601 strings).
+    Make sure every currency code has an assets row.
+    Commits on its own so the short assets lock is not held for the whole ingest.
     """
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    codes = sorted(set(codes))
+    if not codes:
+        return
+    with conn.cursor() as cur:
+        # Sorted inserts keep concurrent ingests from deadlocking on the unique index; the
+        # NOT EXISTS keeps known codes from burning SMALLSERIAL values on every ingest.
+        cur.execute(
+            """
+            INSERT INTO assets (code)
+            SELECT c.code FROM unnest(%s::text[]) AS c(code)
+            WHERE NOT EXISTS (SELECT 1 FROM assets a WHERE a.code = c.code)
+            ON CONFLICT (code) DO NOTHING;
+            """,
+            (codes,),
+        )
+    conn.commit()
 
-        # Build the query with placeholders to prevent SQL injection
-        sql = """
-            SELECT
-                external_id AS id,
-                slug,
-                title,
-                description,
-                published_at,
-                created_at,
-                kind
-            FROM news_items
+
+def tag_news_item(cur, news_item_id: int, published_at, codes: List[str]) -> None:
+    """Record the currencies of one news_items row in news_item_assets (call ensure_assets first)"""
+    if not codes:
+        return
+    # Asset ids are looked up in the same statement, so there is no id cache to go stale.
+    cur.execute(
         """
-        params = []
+        INSERT INTO news_item_assets (news_item_id, asset_id, published_at)
+        SELECT %s, id, %s FROM assets WHERE code = ANY(%s)
+        ON CONFLICT (news_item_id, asset_id) DO NOTHING;
+        """,
+        (news_item_id, published_at, codes),
+    )
+
+
+def encode_news_event(row: tuple, currencies: List[str]) -> str:
+    """
+    Serialize a stored news row (NEWS_FIELDS order, formatted like get_news_rows) for NOTIFY,
+    trimming the description, then the title, to fit the payload limit
+    """
+    event = dict(zip(NEWS_FIELDS, row))
+    event["currencies"] = currencies
+    payload = orjson.dumps(event)
+    for field in ("description", "title"):
+        if len(payload) <= _NOTIFY_LIMIT:
+            break
+        # The limit is in bytes, so cut the UTF-8 encoding (dropping a split character)
+        # rather than a character count. JSON escapes can make a field cost more than its
+        # bytes, hence the loop.
+        while len(payload) > _NOTIFY_LIMIT and event[field]:
+            encoded = event[field].encode("utf-8")
+            keep = len(encoded) - (len(payload) - _NOTIFY_LIMIT) - 3
+            if keep <= 0:
+                event[field] = ""
+            else:
+                event[field] = encoded[:keep].decode("utf-8", "ignore").rstrip() + "..."
+            payload = orjson.dumps(event)
+    return payload.decode("utf-8")
+
+
+def _insert_news_items(conn, results: List[dict]) -> int:
+    """
+    Insert items one by one, skipping duplicates; returns the number of new rows.
+    New rows are tagged with their currencies and also announced on NEWS_CHANNEL, delivered when the transaction commits.
+    A run in which at least one item was stored or already known is recorded in ingest_runs in the same transaction.
+    """
+    ensure_assets(conn, [code for item in results for code in currency_codes(item)])
+    cur = conn.cursor()
+    items_saved = 0
+    items_failed = 0
+    for item in results:
+        # A savepoint per item: one failing item is rolled back alone instead of
+        # aborting the transaction and silently dropping the rest of the batch.
+        cur.execute("SAVEPOINT news_item;")
+        try:
+            # Use parameterized query to prevent SQL injection
+            sql = f"""
+            INSERT INTO news_items AS n (
+                external_id, slug, title, description, 
+                published_at, created_at, kind
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (external_id) DO NOTHING
+            RETURNING n.id, n.published_at, {_NEWS_COLUMNS};
+            """
+
+            values = (
+                item.get('id'),
+                item.get('slug', ''),
+                item.get('title', ''),
+                item.get('description', ''),
+                item.get('published_at', ''),
+                item.get('created_at', ''),
+                item.get('kind', '')
+            )
+
+            cur.execute(sql, values)
+            inserted = cur.fetchone()
+            codes = currency_codes(item)
+            if inserted is not None:
+                tag_news_item(cur, inserted[0], inserted[1], codes)
+            cur.execute("RELEASE SAVEPOINT news_item;")
+
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT news_item;")
+            INGEST_ITEMS.labels("error").inc()
+            items_failed += 1
+            print(f"❌ Error inserting item {item.get('id')}: {e}")
+            continue
+
+        if inserted is None:
+            INGEST_ITEMS.labels("duplicate").inc()
+            continue
+        items_saved += 1
+        INGEST_ITEMS.labels("new").inc()
+
+        # The notify gets its own savepoint: a failed push event must not take the stored row with it.
+        cur.execute("SAVEPOINT news_event;")
+        try:
+            # The event carries the stored row, formatted exactly as /api/v1/news returns it.
+            event = encode_news_event(inserted[2:], codes)
+            cur.execute("SELECT pg_notify(%s, %s);", (NEWS_CHANNEL, event))
+            cur.execute("RELEASE SAVEPOINT news_event;")
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT news_event;")
+            STREAM_EVENTS.labels("notify_failed").inc()
+            print(f"⚠️ Stored item {item.get('id')} but could not announce it: {e}")
+
+    # Health reports this as the last successful ingestion, so a run where every item failed is not one.
+    if items_failed < len(results):
+        cur.execute(
+            "INSERT INTO ingest_runs (items_fetched, items_saved) VALUES (%s, %s);",
+            (len(results), items_saved),
+        )
+    conn.commit()
+    cur.close()
+    return items_saved
+
+
+# Column order of the rows returned by get_news_rows (matches models.NewsItem).
+NEWS_FIELDS = ("id", "slug", "title", "description", "published_at", "created_at", "kind")
+
+
+def _iso_utc(column: str) -> str:
+    """
+    SQL rendering a timestamptz as an ISO8601 UTC string, like datetime.isoformat():
+    microseconds are included only when non-zero. Timestamps are rendered by Postgres
+    so the read path never builds datetime objects.
+    """
+    return (
+        f"to_char({column} AT TIME ZONE 'UTC', CASE WHEN {column} = date_trunc('second', {column}) "
+        """THEN 'YYYY-MM-DD"T"HH24:MI:SS"+00:00"' ELSE 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"' END)"""
+    )
+
+
+# Select list for NEWS_FIELDS over news_items aliased as n: JSON-ready values
+# (ISO8601 UTC timestamps as strings, NULL text columns as '').
+_NEWS_COLUMNS = f"""
+    n.external_id,
+    COALESCE(n.slug, ''),
+    n.title,
+    COALESCE(n.description, ''),
+    COALESCE({_iso_utc('n.published_at')}, ''),
+    COALESCE({_iso_utc('n.created_at')}, ''),
+    COALESCE(n.kind, '')
+"""
+
+
+def get_news_rows(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    currency: Optional[str] = None,
+) -> List[tuple]:
+    """
+    Fetch the latest 100 news rows as plain tuples in NEWS_FIELDS order, already JSON-ready.
+    Optionally filter by published_at between start and end (ISO8601 strings)
+    and by a currency code, which is served from idx_news_assets_asset_published.
+    """
+    if currency:
+        # Walk the (asset_id, published_at) index, then join the matching news rows.
+        source = "news_item_assets na JOIN news_items n ON n.id = na.news_item_id"
+        time_column = "na.published_at"
+        conditions = ["na.asset_id = (SELECT id FROM assets WHERE code = %s)"]
+        params = [currency.strip().upper()]
+        query_name = "get_news_by_currency"
+    else:
+        source = "news_items n"
+        time_column = "n.published_at"
         conditions = []
+        params = []
+        query_name = "get_news"
+
+    try:
+        # Build the query with placeholders to prevent SQL injection
         if start:
-            conditions.append("published_at >= %s")
+            conditions.append(f"{time_column} >= %s")
             params.append(start)
         if end:
-            conditions.append("published_at <= %s")
+            conditions.append(f"{time_column} <= %s")
             params.append(end)
+        sql = f"SELECT {_NEWS_COLUMNS} FROM {source}"
         if conditions:
             sql += " WHERE " + " AND ".join(conditions)
-        sql += " ORDER BY published_at DESC LIMIT 100;"
-
-        cur.execute(sql, params)
-        rows = cur.fetchall()
-
-        # Convert rows to a list of dicts
-        news_items = []
-        for row in rows:
-            news_items.append({
-                "id": row["id"],
-                "slug": row["slug"],
-                "title": row["title"],
-                "description": row["description"],
-                "published_at": row["published_at"].isoformat() if row["published_at"] else "",
-                "created_at": row["created_at"].isoformat() if row["created_at"] else "",
-                "kind": row["kind"]
-            })
+        sql += f" ORDER BY {time_column} DESC LIMIT 100;"
 
-        cur.close()
-        conn.close()
+        with pooled_connection() as conn, timed(DB_QUERY_LATENCY, query_name):
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+            conn.commit()
 
-        return news_items
+        return rows
 
+    except PoolTimeout as e:
+        raise HTTPException(status_code=503, detail=f"Database busy: {e}")
     except Exception as e:
-        print(f"❌ Error in get_news_from_database: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching news from database: {e}")
\ No newline at end of file
+        print(f"❌ Error in get_news_rows: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching news from database: {e}")
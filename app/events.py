@@ -0,0 +1,204 @@
+"""
+Push delivery of newly ingested news items
+
+save_to_database announces every new row with NOTIFY on NEWS_CHANNEL, so whichever
+worker ran the ingest, each worker's listener thread receives it and fans it out to
+its own SSE/WebSocket subscribers. A subscriber that still has STREAM_BUFFER_SIZE
+events queued when the next delivery arrives is disconnected instead of slowing down
+ingestion or other clients.
+"""
+import asyncio
+import os
+import select
+import threading
+from typing import Iterable, Optional
+
+import orjson
+import psycopg2.extensions
+
+from .database import NEWS_CHANNEL, get_db_connection
+from .metrics import STREAM_EVENTS, STREAM_SUBSCRIBERS
+
+STREAM_BUFFER_SIZE = int(os.getenv("STREAM_BUFFER_SIZE", "100"))
+STREAM_RECONNECT_SECONDS = float(os.getenv("STREAM_RECONNECT_SECONDS", "5"))
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+
+# Queued in place of an event when a subscriber is disconnected for falling behind.
+DROPPED = object()
+
+
+def _parse_filter(value: Optional[str]) -> Optional[frozenset]:
+    """Turn a comma-separated query value into an upper-cased set (None = no filter)"""
+    if not value:
+        return None
+    codes = frozenset(part.strip().upper() for part in value.split(",") if part.strip())
+    return codes or None
+
+
+class Subscription:
+    """One connected client: its filters and its event buffer"""
+
+    def __init__(self, transport: str, kinds: Optional[str] = None, currencies: Optional[str] = None,
+                 buffer_size: int = STREAM_BUFFER_SIZE):
+        self.transport = transport
+        self.kinds = _parse_filter(kinds)
+        self.currencies = _parse_filter(currencies)
+        # Unbounded so one delivery (everything a transaction notified) always fits; the
+        # buffer size is enforced between deliveries by drop_if_behind().
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.buffer_size = buffer_size
+        self.dropped = False
+
+    def matches(self, event: dict) -> bool:
+        if self.kinds is not None and (event.get("kind") or "").upper() not in self.kinds:
+            return False
+        if self.currencies is not None and self.currencies.isdisjoint(event.get("currencies") or ()):
+            return False
+        return True
+
+    def drop_if_behind(self) -> bool:
+        """
+        Called before each delivery: a subscriber still holding buffer_size events from
+        earlier deliveries is not keeping up, so its backlog is dropped and it is marked
+        as dropped. A large single delivery alone never counts as falling behind.
+        """
+        if self.dropped or self.queue.qsize() < self.buffer_size:
+            return self.dropped
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(DROPPED)
+        return True
+
+    def offer(self, payload: str) -> bool:
+        """Queue a payload unless the subscriber has been dropped"""
+        if self.dropped:
+            return False
+        self.queue.put_nowait(payload)
+        return True
+
+
+class NewsBroadcaster:
+    """LISTENs on NEWS_CHANNEL in a background thread and fans events out on the event loop"""
+
+    def __init__(self, channel: str = NEWS_CHANNEL):
+        self.channel = channel
+        self._subscribers: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._loop = loop
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen_forever, name="news-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=STREAM_RECONNECT_SECONDS)
+            self._thread = None
+
+    def subscribe(self, transport: str, kinds: Optional[str] = None,
+                  currencies: Optional[str] = None) -> Subscription:
+        subscription = Subscription(transport, kinds, currencies)
+        self._subscribers.add(subscription)
+        STREAM_SUBSCRIBERS.labels(transport).inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            STREAM_SUBSCRIBERS.labels(subscription.transport).dec()
+
+    def publish(self, payloads: Iterable[str]) -> None:
+        """
+        Deliver one batch of raw event payloads to matching subscribers (must run on the
+        event loop). Slow subscribers are dropped before the batch, never because of it.
+        """
+        for subscription in list(self._subscribers):
+            if subscription.drop_if_behind():
+                STREAM_EVENTS.labels("dropped_subscriber").inc()
+                self.unsubscribe(subscription)
+        subscribers = list(self._subscribers)
+        for payload in payloads:
+            STREAM_EVENTS.labels("received").inc()
+            event = orjson.loads(payload)
+            for subscription in subscribers:
+                if subscription.matches(event) and subscription.offer(payload):
+                    STREAM_EVENTS.labels("delivered").inc()
+
+    def _listen_forever(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = get_db_connection()
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel};")
+                print(f"📡 Listening for new news items on '{self.channel}'")
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        payloads = [notify.payload for notify in conn.notifies]
+                        conn.notifies.clear()
+                        self._loop.call_soon_threadsafe(self.publish, payloads)
+            except Exception as e:
+                print(f"❌ News listener error: {e}")
+                self._stop.wait(STREAM_RECONNECT_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+broadcaster = NewsBroadcaster()
+
+
+async def sse_events(subscription: Subscription, request):
+    """Yield Server-Sent Events for a subscription until the client leaves or is dropped"""
+    try:
+        while True:
+            try:
+                payload = await asyncio.wait_for(subscription.queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            if payload is DROPPED:
+                yield 'event: dropped\ndata: {"reason": "slow consumer"}\n\n'
+                break
+            yield f"event: news\ndata: {payload}\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+async def websocket_events(subscription: Subscription, websocket) -> None:
+    """Forward a subscription to a WebSocket until either side goes away"""
+    # Watch for the client closing so idle sockets are released without waiting for an event.
+    receiver = asyncio.ensure_future(websocket.receive())
+    try:
+        while True:
+            getter = asyncio.ensure_future(subscription.queue.get())
+            done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    getter.cancel()
+                    break
+                receiver = asyncio.ensure_future(websocket.receive())
+            if getter not in done:
+                getter.cancel()
+                continue
+            payload = getter.result()
+            if payload is DROPPED:
+                await websocket.close(code=1008, reason="slow consumer")
+                break
+            await websocket.send_text(payload)
+    finally:
+        receiver.cancel()
+        broadcaster.unsubscribe(subscription)
@@ -0,0 +1,274 @@
+"""
+Columnar export of news_items and fear_and_greed_index
+
+Rows are read through a server-side cursor in EXPORT_BATCH_SIZE chunks and turned
+into Arrow record batches one chunk at a time, so memory stays bounded no matter
+how large the table is. Two consumers:
+- export_parquet(): incremental, month-partitioned Parquet files
+  (<dir>/<dataset>/month=YYYY-MM/part-<run>.parquet); each run covers the rows
+  ingested since the previous one
+- arrow_stream(): an Arrow IPC stream for a time range, served by the API
+"""
+import fcntl
+import io
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .database import get_db_connection
+from .metrics import DB_QUERY_LATENCY, timed
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "20000"))
+EXPORT_STATE_FILE = "_export_state.json"
+EXPORT_LOCK_FILE = ".export.lock"
+# Rows become exportable this long after their ingest transaction started. Ingest
+# transactions only run the inserts (the upstream fetch happens before), so they end
+# long before this and every row older than the cutoff is already committed.
+EXPORT_SAFETY_LAG_SECONDS = float(os.getenv("EXPORT_SAFETY_LAG_SECONDS", "300"))
+# Concurrent Arrow streams per worker; each holds its own database connection.
+EXPORT_MAX_STREAMS = int(os.getenv("EXPORT_MAX_STREAMS", "2"))
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+_stream_slots = threading.BoundedSemaphore(EXPORT_MAX_STREAMS)
+
+_TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+
+def _epoch_us(column: str) -> str:
+    # Microseconds since the epoch as bigint, so Arrow columns are built without datetime
+    # objects. date_part (double) is much cheaper than extract (numeric) and exact to the µs.
+    return f"(date_part('epoch', {column}) * 1000000)::bigint"
+
+
+class ExportBusy(Exception):
+    """EXPORT_MAX_STREAMS Arrow streams are already running in this worker"""
+
+
+@contextmanager
+def _dedicated_connection():
+    """
+    A connection of the export's own. A stream stays open for as long as the client
+    keeps reading, so it must never hold one of the API pool's connections.
+    """
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """How one table maps to an Arrow schema"""
+    name: str
+    table: str
+    time_column: str
+    select: tuple
+    schema: pa.Schema
+
+
+NEWS_EXPORT = ExportSpec(
+    name="news",
+    table="news_items",
+    time_column="published_at",
+    select=(
+        "id", "external_id", "slug", "title", "description",
+        _epoch_us("published_at"), _epoch_us("created_at"), "kind",
+    ),
+    schema=pa.schema([
+        ("id", pa.int32()),
+        ("external_id", pa.int32()),
+        ("slug", pa.string()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("published_at", _TIMESTAMP),
+        ("created_at", _TIMESTAMP),
+        ("kind", pa.string()),
+    ]),
+)
+
+FEAR_AND_GREED_EXPORT = ExportSpec(
+    name="fear_and_greed",
+    table="fear_and_greed_index",
+    time_column="timestamp_utc",
+    select=("id", _epoch_us("timestamp_utc"), "value", "value_classification::text"),
+    schema=pa.schema([
+        ("id", pa.int32()),
+        ("timestamp_utc", _TIMESTAMP),
+        ("value", pa.int16()),
+        ("value_classification", pa.string()),
+    ]),
+)
+
+EXPORT_SPECS = (NEWS_EXPORT, FEAR_AND_GREED_EXPORT)
+
+
+def _iter_row_chunks(conn, spec: ExportSpec, conditions: list, params: list,
+                     batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[list]:
+    """Yield lists of row tuples (columns as in spec.select) matching conditions, in id order"""
+    sql = f"SELECT {', '.join(spec.select)} FROM {spec.table}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY id;"
+
+    # A named cursor keeps the result set on the server; only batch_size rows are in memory.
+    with conn.cursor(name=f"export_{spec.name}") as cur:
+        cur.itersize = batch_size
+        with timed(DB_QUERY_LATENCY, f"export_{spec.name}"):
+            cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
+
+def rows_to_batch(spec: ExportSpec, rows: list) -> pa.RecordBatch:
+    """Build a record batch from row tuples"""
+    columns = list(zip(*rows))
+    arrays = [pa.array(columns[index], type=field.type) for index, field in enumerate(spec.schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=spec.schema)
+
+
+def arrow_stream(spec: ExportSpec, start: Optional[str] = None, end: Optional[str] = None,
+                 batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Yield an Arrow IPC stream (schema, then one message per batch) for a time range.
+    The query runs before the first chunk is yielded, so a caller can pull that chunk
+    to surface database errors (or ExportBusy) before any bytes are sent.
+    """
+    if not _stream_slots.acquire(blocking=False):
+        raise ExportBusy(f"{EXPORT_MAX_STREAMS} exports already running, try again later")
+    try:
+        yield from _arrow_chunks(spec, start, end, batch_size)
+    finally:
+        _stream_slots.release()
+
+
+def _arrow_chunks(spec: ExportSpec, start: Optional[str], end: Optional[str],
+                  batch_size: int) -> Iterator[bytes]:
+    conditions, params = [], []
+    if start:
+        conditions.append(f"{spec.time_column} >= %s")
+        params.append(start)
+    if end:
+        conditions.append(f"{spec.time_column} <= %s")
+        params.append(end)
+    sink = io.BytesIO()
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate(0)
+        return data
+
+    with _dedicated_connection() as conn:
+        chunks = _iter_row_chunks(conn, spec, conditions, params, batch_size)
+        first = next(chunks, None)
+        writer = pa.ipc.new_stream(sink, spec.schema)
+        if first is not None:
+            writer.write_batch(rows_to_batch(spec, first))
+        yield drain()
+        for rows in chunks:
+            writer.write_batch(rows_to_batch(spec, rows))
+            yield drain()
+        writer.close()
+    yield drain()
+
+
+def _load_state(output_dir: Path) -> dict:
+    path = output_dir / EXPORT_STATE_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_state(output_dir: Path, state: dict) -> None:
+    # Write-then-rename so an interrupted run never leaves a half-written state file.
+    path = output_dir / EXPORT_STATE_FILE
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+@contextmanager
+def _exclusive_run(output_dir: Path):
+    """Serialise export runs on one directory; two runs would start from the same watermark"""
+    with open(output_dir / EXPORT_LOCK_FILE, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def export_parquet(output_dir, specs=EXPORT_SPECS, batch_size: int = EXPORT_BATCH_SIZE,
+                   safety_lag: float = EXPORT_SAFETY_LAG_SECONDS) -> dict:
+    """
+    Append rows ingested since the previous run to month-partitioned Parquet files.
+
+    Each run exports the half-open window [previous cutoff, now() - safety_lag) of
+    ingested_at, so every row lands in exactly one run even when concurrent ingests
+    commit out of id order. Returns {dataset: {"rows": n, "files": [...], "ingested_before": iso}}.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with _exclusive_run(output_dir):
+        return _export_parquet(output_dir, specs, batch_size, safety_lag)
+
+
+def _export_parquet(output_dir: Path, specs, batch_size: int, safety_lag: float) -> dict:
+    state = _load_state(output_dir)
+    # Unique per run so a part file can never replace one written by an earlier run.
+    run_id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    summary = {}
+
+    for spec in specs:
+        previous_cutoff = state.get(spec.name)
+        writers = {}
+        rows_written = 0
+        try:
+            with _dedicated_connection() as conn:
+                with conn.cursor() as cur:
+                    # Never move backwards (e.g. a run with a longer lag), or rows would be exported twice.
+                    cur.execute("SELECT GREATEST(now() - make_interval(secs => %s), %s::timestamptz);",
+                                (safety_lag, previous_cutoff))
+                    cutoff = cur.fetchone()[0].isoformat()
+                conditions, params = ["ingested_at < %s"], [cutoff]
+                if previous_cutoff:
+                    conditions.append("ingested_at >= %s")
+                    params.append(previous_cutoff)
+                for rows in _iter_row_chunks(conn, spec, conditions, params, batch_size):
+                    batch = rows_to_batch(spec, rows)
+                    months = pc.fill_null(pc.strftime(batch[spec.time_column], format="%Y-%m"), "unknown")
+                    for month in pc.unique(months).to_pylist():
+                        if month not in writers:
+                            final = output_dir / spec.name / f"month={month}" / f"part-{run_id}.parquet"
+                            final.parent.mkdir(parents=True, exist_ok=True)
+                            tmp = final.with_suffix(".parquet.tmp")
+                            writers[month] = (pq.ParquetWriter(tmp, spec.schema, compression="zstd"), tmp, final)
+                        writers[month][0].write_batch(batch.filter(pc.equal(months, month)))
+                    rows_written += len(rows)
+        except Exception:
+            for writer, tmp, _ in writers.values():
+                writer.close()
+                tmp.unlink(missing_ok=True)
+            raise
+
+        files = []
+        for writer, tmp, final in writers.values():
+            writer.close()
+            tmp.replace(final)
+            files.append(str(final))
+        state[spec.name] = cutoff
+        _save_state(output_dir, state)
+        summary[spec.name] = {"rows": rows_written, "files": sorted(files), "ingested_before": cutoff}
+
+    return summary
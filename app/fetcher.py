@@ -0,0 +1,199 @@
+"""
+Coalesced CryptoPanic fetches
+
+Requests with the same (filter, currencies, kind) that arrive while a fetch is
+running share its upstream call and database write, and a successfully saved
+result is reused for FETCH_REUSE_SECONDS. Background fetches are tracked as jobs
+that can be polled by id. Coalescing is per app worker.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from .crypto_api import fetch_crypto_news
+from .database import save_to_database
+from .metrics import FETCH_REQUESTS
+from .models import FetchJobStatus
+
+FETCH_REUSE_SECONDS = float(os.getenv("FETCH_REUSE_SECONDS", "30"))
+FETCH_JOB_HISTORY = int(os.getenv("FETCH_JOB_HISTORY", "200"))
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+ARCHIVE_FILE = os.path.join(DATA_DIR, "crypto_news_data.json")
+
+# Fetches with different keys run concurrently in the threadpool; only one may write the archive at a time.
+_archive_lock = threading.Lock()
+
+
+@dataclass
+class FetchResult:
+    """Outcome of one upstream fetch plus database write"""
+    results: list
+    db_success: bool
+    finished_at: float
+
+
+def fetch_key(filter_type: str, currencies: str, kind: str) -> tuple:
+    """Normalise request parameters so equivalent requests coalesce (BTC,ETH == eth,btc)"""
+    codes = ",".join(sorted({code.strip().upper() for code in currencies.split(",") if code.strip()}))
+    return (filter_type.strip().lower(), codes, kind.strip().lower())
+
+
+def fetch_and_save(filter_type: str, currencies: str, kind: str) -> FetchResult:
+    """Fetch from CryptoPanic, save to the database and archive the raw response"""
+    results = fetch_crypto_news(filter_type=filter_type, currencies=currencies, kind=kind)
+    if not results:
+        return FetchResult(results=[], db_success=False, finished_at=time.monotonic())
+
+    db_success = save_to_database(results)
+
+    _archive(results)
+    return FetchResult(results=results, db_success=db_success, finished_at=time.monotonic())
+
+
+def _archive(results: list) -> None:
+    """Save the raw response to data/crypto_news_data.json (input of scripts/backfill_currencies.py)"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    # Write-then-rename so a reader never sees a half-written archive.
+    tmp = ARCHIVE_FILE + ".tmp"
+    with _archive_lock:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, ARCHIVE_FILE)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Mark a failed fetch task's exception as retrieved even if every caller went away"""
+    if not task.cancelled():
+        task.exception()
+
+
+class FetchCoalescer:
+    """Single-flight wrapper around fetch_and_save plus a registry of background jobs"""
+
+    def __init__(self, reuse_seconds: float = FETCH_REUSE_SECONDS, job_history: int = FETCH_JOB_HISTORY):
+        self.reuse_seconds = reuse_seconds
+        self.job_history = job_history
+        self._inflight: dict = {}
+        # key -> FetchResult in finish order, so expired entries are always at the front.
+        self._recent: OrderedDict = OrderedDict()
+        self._jobs: OrderedDict = OrderedDict()
+        self._active_jobs: dict = {}
+        self._tasks: set = set()
+
+    async def fetch(self, filter_type: str, currencies: str, kind: str) -> FetchResult:
+        """Run or join the fetch for these parameters (must be called on the event loop)"""
+        key = fetch_key(filter_type, currencies, kind)
+
+        recent = self._recent.get(key)
+        if recent is not None and time.monotonic() - recent.finished_at < self.reuse_seconds:
+            FETCH_REQUESTS.labels("reused").inc()
+            return recent
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            FETCH_REQUESTS.labels("coalesced").inc()
+            # shield: a caller going away must not cancel the fetch other callers wait on.
+            return await asyncio.shield(inflight)
+
+        FETCH_REQUESTS.labels("executed").inc()
+        # The fetch runs as its own task so it finishes (and releases waiters) even if
+        # the request that started it is cancelled.
+        task = asyncio.get_running_loop().create_task(self._execute(key, filter_type, currencies, kind))
+        task.add_done_callback(_consume_exception)
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _execute(self, key: tuple, filter_type: str, currencies: str, kind: str) -> FetchResult:
+        try:
+            result = await run_in_threadpool(fetch_and_save, filter_type, currencies, kind)
+        finally:
+            self._inflight.pop(key, None)
+        # Only a fully saved result is worth reusing; a failed save must be retried.
+        if result.results and result.db_success:
+            self._remember(key, result)
+        return result
+
+    def _remember(self, key: tuple, result: FetchResult) -> None:
+        """Store a result for reuse and evict the ones whose reuse window has passed"""
+        self._recent[key] = result
+        self._recent.move_to_end(key)
+        cutoff = time.monotonic() - self.reuse_seconds
+        while self._recent:
+            oldest_key, oldest = next(iter(self._recent.items()))
+            if oldest.finished_at >= cutoff:
+                break
+            del self._recent[oldest_key]
+
+    def start_job(self, filter_type: str, currencies: str, kind: str) -> FetchJobStatus:
+        """Start a background fetch, or return the unfinished job already running for these parameters"""
+        key = fetch_key(filter_type, currencies, kind)
+        active = self._active_jobs.get(key)
+        if active is not None:
+            FETCH_REQUESTS.labels("coalesced").inc()
+            return active
+
+        job = FetchJobStatus(
+            job_id=uuid.uuid4().hex,
+            status="pending",
+            filter=filter_type,
+            currencies=currencies,
+            kind=kind,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        self._jobs[job.job_id] = job
+        self._active_jobs[key] = job
+        while len(self._jobs) > self.job_history:
+            self._jobs.popitem(last=False)
+
+        task = asyncio.get_running_loop().create_task(self._run_job(key, job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[FetchJobStatus]:
+        return self._jobs.get(job_id)
+
+    async def _run_job(self, key: tuple, job: FetchJobStatus) -> None:
+        job.status = "running"
+        try:
+            result = await self.fetch(job.filter, job.currencies, job.kind)
+            job.items_retrieved = len(result.results)
+            job.items_saved = len(result.results) if result.db_success else 0
+            if not result.results:
+                job.status = "failed"
+                job.message = "No news items retrieved from API"
+            elif result.db_success:
+                job.status = "succeeded"
+                job.message = "News fetched and saved successfully"
+            else:
+                job.status = "failed"
+                job.message = "News fetched but database save failed"
+            if job.status == "succeeded":
+                print(f"✅ Background fetch {job.job_id} completed: {job.items_retrieved} items")
+            else:
+                print(f"❌ Background fetch {job.job_id} failed: {job.message}")
+        except HTTPException as e:
+            job.status = "failed"
+            job.message = str(e.detail)
+            print(f"❌ Background fetch {job.job_id} failed: {e.detail}")
+        except Exception as e:
+            job.status = "failed"
+            job.message = f"Unexpected error: {e}"
+            print(f"❌ Background fetch {job.job_id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc).isoformat()
+            self._active_jobs.pop(key, None)
+
+
+coalescer = FetchCoalescer()
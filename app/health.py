@@ -0,0 +1,163 @@
+"""
+Cached dependency probes for the health endpoints
+
+Probes run on a background thread every HEALTH_PROBE_INTERVAL seconds and store an
+immutable snapshot; the endpoints only read that snapshot so polling stays cheap
+no matter how often the agent or the orchestrator calls them.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from .database import pool_stats, pooled_connection
+from .metrics import DB_QUERY_LATENCY, timed
+
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "15"))
+# A snapshot older than this means the prober itself is stuck.
+HEALTH_STALE_AFTER = float(os.getenv("HEALTH_STALE_AFTER", str(HEALTH_PROBE_INTERVAL * 3)))
+
+_STARTED_AT = time.monotonic()
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _latest(conn, sql: str) -> tuple[Optional[datetime], Optional[str]]:
+    """Run a single-value freshness query; an error is returned rather than raised"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+            value = cur.fetchone()[0]
+        conn.commit()
+        return value, None
+    except Exception as e:
+        conn.rollback()
+        return None, str(e)
+
+
+def probe_database() -> dict:
+    """
+    Run one round of dependency checks against Postgres.
+    Only reachability decides readiness; freshness queries report their own errors,
+    so e.g. a database still missing ingest_runs does not take the app out of service.
+    """
+    checked_at = datetime.now(timezone.utc)
+    latest_published = ingested_at = None
+    data_error = ingestion_error = None
+    try:
+        with pooled_connection() as conn, timed(DB_QUERY_LATENCY, "health_probe"):
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.commit()
+            reachable = True
+            error = None
+            # Both columns are indexed, so each max() is an index lookup rather than a scan.
+            latest_published, data_error = _latest(conn, "SELECT max(published_at) FROM news_items;")
+            # Ingest runs are read from the database so every worker (and a restarted
+            # one) reports the same last ingestion.
+            ingested_at, ingestion_error = _latest(conn, "SELECT max(ingested_at) FROM ingest_runs;")
+    except Exception as e:
+        reachable = False
+        error = str(e)
+
+    return {
+        "checked_at": checked_at,
+        "database": {
+            "reachable": reachable,
+            "error": error,
+        },
+        "ingestion": {
+            "last_success_at": _isoformat(ingested_at),
+            "error": ingestion_error,
+        },
+        "data": {
+            "latest_published_at": _isoformat(latest_published),
+            "age_seconds": (
+                round((checked_at - latest_published).total_seconds(), 1)
+                if latest_published
+                else None
+            ),
+            "error": data_error,
+        },
+    }
+
+
+class HealthMonitor:
+    """Background prober holding the most recent dependency snapshot"""
+
+    def __init__(self, interval: float = HEALTH_PROBE_INTERVAL):
+        self.interval = interval
+        self._snapshot: Optional[dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-prober", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def refresh(self) -> dict:
+        """Probe now and replace the cached snapshot"""
+        self._snapshot = probe_database()
+        return self._snapshot
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"❌ Health probe failed: {e}")
+            self._stop.wait(self.interval)
+
+    def snapshot(self) -> Optional[dict]:
+        """Return the cached snapshot (None until the first probe finishes)"""
+        return self._snapshot
+
+    def readiness(self) -> tuple[bool, dict]:
+        """Summarise the snapshot into a ready flag plus a JSON-friendly body"""
+        snapshot = self.snapshot()
+        now = datetime.now(timezone.utc)
+        if snapshot is None:
+            return False, {"status": "starting", "timestamp": now.isoformat()}
+
+        probe_age = (now - snapshot["checked_at"]).total_seconds()
+        stale = probe_age > HEALTH_STALE_AFTER
+        ready = snapshot["database"]["reachable"] and not stale
+        # Pool usage is an in-process counter, so read it live rather than from the probe.
+        stats = pool_stats()
+        body = {
+            "status": "ready" if ready else "not_ready",
+            "timestamp": now.isoformat(),
+            "probe_age_seconds": round(probe_age, 3),
+            "probe_stale": stale,
+            "pool": {
+                "in_use": stats["in_use"],
+                "max": stats["max"],
+                "saturation": round(stats["in_use"] / stats["max"], 3) if stats["max"] else 0.0,
+            },
+            **{key: value for key, value in snapshot.items() if key != "checked_at"},
+        }
+        return ready, body
+
+
+monitor = HealthMonitor()
+
+
+def liveness() -> dict:
+    """The process is up and serving; never touches dependencies"""
+    return {
+        "status": "alive",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "uptime_seconds": round(time.monotonic() - _STARTED_AT, 1),
+    }
@@ -5,18 +5,24 @@ This application provides endpoints for fetching, storing, and retrieving crypto
 using the Crypto Panic API and PostgreSQL database.
 """
 
-import json
-import os
-from datetime import datetime
+import asyncio
+import itertools
 from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 
-from .models import NewsItem, FetchRequest, FetchResponse, NewsQueryResponse
-from .database import save_to_database, get_news_from_database
-from .crypto_api import fetch_crypto_news
+from .models import NewsItem, FetchRequest, FetchResponse, FetchJobStatus, NewsQueryResponse
+from .database import NEWS_FIELDS, get_news_rows
+from .fetcher import coalescer
+from .export import ARROW_STREAM_MEDIA_TYPE, FEAR_AND_GREED_EXPORT, NEWS_EXPORT, ExportBusy, arrow_stream
+from .events import broadcaster, sse_events, websocket_events
+from .health import liveness, monitor
+from .metrics import MetricsMiddleware, render_metrics
 
 # Load environment variables
 load_dotenv()
@@ -27,16 +33,21 @@ app = FastAPI(
     description="AI-powered cryptocurrency news analysis and data extraction",
     version="1.0.0"
 )
+app.add_middleware(MetricsMiddleware)
 
 
-def fetch_and_save_news(filter_type: str, currencies: str, kind: str):
-    """Background task to fetch and save news"""
-    try:
-        results = fetch_crypto_news(filter_type, currencies, kind)
-        save_to_database(results)
-        print(f"✅ Background fetch completed: {len(results)} items")
-    except Exception as e:
-        print(f"❌ Background fetch failed: {e}")
+@app.on_event("startup")
+async def start_background_workers():
+    """Begin background dependency probes and the new-news listener"""
+    monitor.start()
+    broadcaster.start(asyncio.get_running_loop())
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    """Stop background dependency probes and the new-news listener"""
+    monitor.stop()
+    broadcaster.stop()
 
 
 # API Endpoints
@@ -50,22 +61,55 @@ async def root():
         "endpoints": {
             "fetch": "/api/v1/fetch",
             "health": "/health",
+            "health_live": "/health/live",
+            "health_ready": "/health/ready",
+            "metrics": "/metrics",
             "docs": "/docs",
-            "news_from_db": "/api/v1/news"
+            "news_from_db": "/api/v1/news",
+            "news_stream": "/api/v1/news/stream",
+            "news_websocket": "/api/v1/news/ws",
+            "export_news": "/api/v1/export/news",
+            "export_fear_and_greed": "/api/v1/export/fear-and-greed"
         }
     }
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """
+    Health check endpoint with the current server time.
+    Dependency details come from the cached background probe, never a live query.
+    """
+    ready, body = monitor.readiness()
+    database = body.get("database", {})
     return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "database": "connected"
+        **body,
+        "status": "healthy" if ready else "degraded",
+        "database": "connected" if database.get("reachable") else "unavailable",
+        "database_error": database.get("error"),
     }
 
 
+@app.get("/health/live")
+async def health_live():
+    """Liveness probe: the process is up; does not check dependencies"""
+    return liveness()
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness probe: 503 until the database is reachable and probes are current"""
+    ready, body = monitor.readiness()
+    return JSONResponse(content=body, status_code=200 if ready else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 @app.post("/api/v1/fetch", response_model=FetchResponse)
 async def fetch_news(request: FetchRequest):
     """
@@ -74,14 +118,19 @@ async def fetch_news(request: FetchRequest):
     - **filter**: News filter (hot, rising, bullish, bearish, important, saved, lol)
     - **currencies**: Comma-separated currency codes (e.g., BTC,ETH)
     - **kind**: Content type (news, media, all)
+
+    Concurrent requests with the same parameters share one upstream fetch and
+    database write, and a result is reused for a short window afterwards.
     """
     try:
-        # Fetch news from API
-        results = fetch_crypto_news(
+        # Fetch news from API (or join an identical in-flight/recent fetch)
+        fetched = await coalescer.fetch(
             filter_type=request.filter,
             currencies=request.currencies,
             kind=request.kind
         )
+        results = fetched.results
+        db_success = fetched.db_success
         
         if not results:
             return FetchResponse(
@@ -91,16 +140,6 @@ async def fetch_news(request: FetchRequest):
                 items_saved=0
             )
         
-        # Save to database
-        db_success = save_to_database(results)
-        
-        # Save raw data to JSON file (in data directory)
-        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-        os.makedirs(data_dir, exist_ok=True)
-        
-        with open(os.path.join(data_dir, "crypto_news_data.json"), "w", encoding="utf-8") as f:
-            json.dump({"results": results}, f, ensure_ascii=False, indent=2)
-        
         # Convert to Pydantic models for response
         news_items = [NewsItem(**item) for item in results]
         
@@ -130,24 +169,30 @@ async def fetch_news_get(
 
 
 @app.post("/api/v1/fetch/background")
-async def fetch_news_background(
-    request: FetchRequest,
-    background_tasks: BackgroundTasks
-):
-    """Fetch news in background (non-blocking)"""
-    background_tasks.add_task(
-        fetch_and_save_news,
-        request.filter,
-        request.currencies,
-        request.kind
-    )
-    
+async def fetch_news_background(request: FetchRequest):
+    """
+    Fetch news in background (non-blocking).
+    Returns a job id; poll /api/v1/fetch/jobs/{job_id} for the outcome. A request
+    matching a job that is still running gets that job back instead of a new one.
+    """
+    job = coalescer.start_job(request.filter, request.currencies, request.kind)
     return {
         "message": "News fetch started in background",
-        "status": "processing"
+        "status": "processing",
+        "job_id": job.job_id,
+        "status_url": f"/api/v1/fetch/jobs/{job.job_id}"
     }
 
 
+@app.get("/api/v1/fetch/jobs/{job_id}", response_model=FetchJobStatus)
+async def fetch_job_status(job_id: str):
+    """Status of a background fetch job"""
+    job = coalescer.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown fetch job: {job_id}")
+    return job
+
+
 @app.get("/api/v1/news", response_model=NewsQueryResponse)
 async def get_news(
     start: Optional[str] = Query(
@@ -157,26 +202,107 @@ async def get_news(
     end: Optional[str] = Query(
         None,
         description="End timestamp (inclusive) in ISO8601 format, e.g. 2024-06-30T23:59:59"
+    ),
+    currency: Optional[str] = Query(
+        None,
+        description="Only items tagged with this currency code, e.g. ETH"
     )
 ):
     """
     Fetch crypto news directly from the database.
-    Optionally filter by published_at between start and end timestamps (ISO8601).
+    Optionally filter by published_at between start and end timestamps (ISO8601)
+    and by currency code.
     """
     try:
-        news_items = get_news_from_database(start, end)
-        return NewsQueryResponse(
-            success=True,
-            message="News items retrieved from database",
-            items_retrieved=len(news_items),
-            data=[NewsItem(**item) for item in news_items]
-        )
+        # Rows come back JSON-ready from SQL, so encode them directly instead of
+        # round-tripping through NewsItem models; response_model still documents the shape.
+        # Blocking query (and pool wait) runs off the event loop.
+        rows = await run_in_threadpool(get_news_rows, start, end, currency)
+        return ORJSONResponse({
+            "success": True,
+            "message": "News items retrieved from database",
+            "items_retrieved": len(rows),
+            "data": [dict(zip(NEWS_FIELDS, row)) for row in rows]
+        })
     except HTTPException as e:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
+@app.get("/api/v1/news/stream")
+async def stream_news(
+    request: Request,
+    kind: Optional[str] = Query(None, description="Comma-separated kinds to receive, e.g. news,media"),
+    currencies: Optional[str] = Query(None, description="Comma-separated currency codes, e.g. BTC,ETH")
+):
+    """
+    Server-Sent Events stream of news items as they are ingested.
+    Clients that fall too far behind receive a `dropped` event and are disconnected.
+    """
+    subscription = broadcaster.subscribe("sse", kind, currencies)
+    return StreamingResponse(
+        sse_events(subscription, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/api/v1/news/ws")
+async def news_websocket(
+    websocket: WebSocket,
+    kind: Optional[str] = None,
+    currencies: Optional[str] = None
+):
+    """WebSocket push of newly ingested news items (same filters as the SSE stream)"""
+    await websocket.accept()
+    subscription = broadcaster.subscribe("websocket", kind, currencies)
+    await websocket_events(subscription, websocket)
+
+
+async def _arrow_export(spec, start: Optional[str], end: Optional[str]) -> StreamingResponse:
+    """
+    Start an Arrow IPC export; errors before the first batch become a 500 (503 when too
+    many exports are running) instead of a cut stream
+    """
+    chunks = arrow_stream(spec, start, end)
+    try:
+        first = await run_in_threadpool(next, chunks)
+    except ExportBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
+    # Closing the generator afterwards (also after a disconnect) frees its connection and
+    # export slot right away instead of whenever it happens to be garbage collected.
+    return StreamingResponse(
+        itertools.chain([first], chunks),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{spec.name}.arrows"'},
+        background=BackgroundTask(chunks.close)
+    )
+
+
+@app.get("/api/v1/export/news")
+async def export_news(
+    start: Optional[str] = Query(None, description="Start of published_at range (inclusive), ISO8601"),
+    end: Optional[str] = Query(None, description="End of published_at range (inclusive), ISO8601")
+):
+    """
+    Stream news items as an Arrow IPC stream, read from the database in batches.
+    Load with e.g. pyarrow.ipc.open_stream(response.raw).read_all().
+    """
+    return await _arrow_export(NEWS_EXPORT, start, end)
+
+
+@app.get("/api/v1/export/fear-and-greed")
+async def export_fear_and_greed(
+    start: Optional[str] = Query(None, description="Start of timestamp_utc range (inclusive), ISO8601"),
+    end: Optional[str] = Query(None, description="End of timestamp_utc range (inclusive), ISO8601")
+):
+    """Stream the fear and greed index history as an Arrow IPC stream"""
+    return await _arrow_export(FEAR_AND_GREED_EXPORT, start, end)
+
+
 if __name__ == "__main__":
     print("🚀 Starting Crypto News AI API Server")
     print("📖 API Documentation available at: http://localhost:8000/docs")
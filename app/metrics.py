@@ -0,0 +1,208 @@
+"""
+Prometheus metrics for Crypto News API
+
+All collectors live in the default registry so the FastAPI app can serve them on
+/metrics and the agent CLI can expose the same series with start_metrics_server().
+"""
+import os
+import time
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+
+# Buckets tuned for an API whose answers range from sub-millisecond cache hits
+# to multi-second upstream calls.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "crypto_news_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS = Counter(
+    "crypto_news_http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "crypto_news_db_query_duration_seconds",
+    "Database query latency by logical query name",
+    ["query"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "crypto_news_db_pool_connections",
+    "Database pool connections by state (in_use, max)",
+    ["state"],
+)
+DB_POOL_WAIT = Histogram(
+    "crypto_news_db_pool_wait_seconds",
+    "Time spent waiting for a free pooled connection",
+    buckets=LATENCY_BUCKETS,
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "crypto_news_upstream_request_duration_seconds",
+    "Latency of calls to upstream services (cryptopanic, tavily)",
+    ["service"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "crypto_news_upstream_errors_total",
+    "Failed calls to upstream services",
+    ["service"],
+)
+
+FETCH_REQUESTS = Counter(
+    "crypto_news_fetch_requests_total",
+    "Fetch requests by how they were served (executed, coalesced, reused)",
+    ["outcome"],
+)
+
+INGEST_ITEMS = Counter(
+    "crypto_news_ingest_items_total",
+    "News items seen by save_to_database by outcome (fetched, new, duplicate, error)",
+    ["outcome"],
+)
+
+STREAM_SUBSCRIBERS = Gauge(
+    "crypto_news_stream_subscribers",
+    "Connected push subscribers by transport (sse, websocket)",
+    ["transport"],
+)
+STREAM_EVENTS = Counter(
+    "crypto_news_stream_events_total",
+    "Push events by outcome (received, delivered, dropped_subscriber, notify_failed)",
+    ["outcome"],
+)
+
+STAGE_LATENCY = Histogram(
+    "crypto_news_stage_duration_seconds",
+    "Latency of named stages in the tools and agent loop",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class timed:
+    """
+    Context manager that observes the elapsed wall time into a histogram.
+
+    Usage:
+        with timed(UPSTREAM_LATENCY, "cryptopanic"):
+            ...
+        with timed(STAGE_LATENCY, "agent.invoke"):
+            ...
+
+    Implemented as a small class rather than a generator so entering and leaving
+    costs only two perf_counter() calls and one observe().
+    """
+
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, histogram: Histogram, *labelvalues: str):
+        self._child = histogram.labels(*labelvalues) if labelvalues else histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the exposition payload and its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: Optional[int] = None) -> bool:
+    """
+    Expose metrics over HTTP for processes that are not the FastAPI app (e.g. the agent CLI).
+    Uses METRICS_PORT when no port is given; does nothing if neither is set.
+    """
+    port = port or int(os.getenv("METRICS_PORT", "0") or 0)
+    if not port:
+        return False
+    start_http_server(port)
+    return True
+
+
+# Long-lived responses (SSE, Arrow export streams) whose latency is time to first byte:
+# their full duration is however long the client stays connected.
+_STREAMING_MEDIA_TYPES = (b"text/event-stream", b"application/vnd.apache.arrow.stream")
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency and status per route template.
+
+    Labels use the matched route path (e.g. /api/v1/news) rather than the raw URL
+    so query strings and path parameters cannot blow up series cardinality.
+    Streaming responses are timed to their first byte (the response start) instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: dict = {}
+
+    def _route_label(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            # Older Starlette only stores the endpoint in the scope; resolve it once.
+            for candidate in scope["app"].routes:
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    path = candidate.path
+                    break
+            else:
+                path = "unmatched"
+            self._route_paths[endpoint] = path
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+        first_byte_holder = [None]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+                content_type = dict(message.get("headers", ())).get(b"content-type", b"")
+                if content_type.startswith(_STREAMING_MEDIA_TYPES):
+                    first_byte_holder[0] = time.perf_counter() - start
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = first_byte_holder[0]
+            if elapsed is None:
+                elapsed = time.perf_counter() - start
+            method = scope["method"]
+            route = self._route_label(scope)
+            HTTP_REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status_holder[0])).inc()
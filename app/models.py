@@ -37,4 +37,18 @@ class NewsQueryResponse(BaseModel):
     success: bool
     message: str
     items_retrieved: int
-    data: Optional[List[NewsItem]] = None
\ No newline at end of file
+    data: Optional[List[NewsItem]] = None
+
+
+class FetchJobStatus(BaseModel):
+    """Status of a background fetch job"""
+    job_id: str
+    status: str  # pending, running, succeeded, failed
+    filter: str
+    currencies: str
+    kind: str
+    created_at: str
+    finished_at: Optional[str] = None
+    items_retrieved: int = 0
+    items_saved: int = 0
+    message: Optional[str] = None
@@ -1,5 +1,24 @@
-from .health_tool import get_health
-from .news_tool import get_db_news
-from .search_tool import search_web
+"""LangChain tools for the agent, imported on first access to keep startup light."""
+from importlib import import_module
+
+# Public tool name -> submodule that defines it
+_TOOL_MODULES = {
+    "get_health": ".health_tool",
+    "get_db_news": ".news_tool",
+    "search_web": ".search_tool",
+}
 
 __all__ = ["get_health", "get_db_news", "search_web"]
+
+
+def __getattr__(name):
+    module = _TOOL_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,6 +4,7 @@ import requests
 from langchain_core.tools import tool
 
 from app.config import API_BASE_URL
+from app.metrics import STAGE_LATENCY, timed
 
 
 @tool
@@ -11,5 +12,6 @@ def get_health():
     """
     Return the /health JSON so the agent knows the service status and current time.
     """
-    response = requests.get(f"{API_BASE_URL}/health", timeout=10)
+    with timed(STAGE_LATENCY, "tool.get_health"):
+        response = requests.get(f"{API_BASE_URL}/health", timeout=10)
     return response.json()
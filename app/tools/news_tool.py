@@ -1,19 +1,27 @@
 """Tool for pulling time-bounded news rows from the API backend."""
 
+from typing import Optional
+
 import requests
 from langchain_core.tools import tool
 
 from app.config import API_BASE_URL
+from app.metrics import STAGE_LATENCY, timed
 
 
 @tool
-def get_db_news(start_date: str, end_date: str):
+def get_db_news(start_date: str, end_date: str, currency: Optional[str] = None):
     """
     Hit the news endpoint so the agent can summarise rows already stored in our DB.
+    Pass a currency code (e.g. "ETH") to get only news tagged with that asset.
     """
-    response = requests.get(
-        f"{API_BASE_URL}/api/v1/news",
-        params={"start": start_date, "end": end_date},
-        timeout=15,
-    )
+    params = {"start": start_date, "end": end_date}
+    if currency:
+        params["currency"] = currency
+    with timed(STAGE_LATENCY, "tool.get_db_news"):
+        response = requests.get(
+            f"{API_BASE_URL}/api/v1/news",
+            params=params,
+            timeout=15,
+        )
     return response.json()
@@ -9,6 +9,8 @@ from typing import Any, Dict, List
 import requests
 from langchain_core.tools import tool
 
+from app.metrics import UPSTREAM_ERRORS, UPSTREAM_LATENCY, timed
+
 TAVILY_SEARCH_URL = "https://api.tavily.com/search"
 LOG_PATH = Path("logs/web_search.log")
 
@@ -49,9 +51,11 @@ def search_web(query: str, max_results: int = 3) -> Dict[str, Any]:
     }
 
     try:
-        response = requests.post(TAVILY_SEARCH_URL, json=payload, timeout=20)
+        with timed(UPSTREAM_LATENCY, "tavily"):
+            response = requests.post(TAVILY_SEARCH_URL, json=payload, timeout=20)
         response.raise_for_status()
     except requests.RequestException as exc:
+        UPSTREAM_ERRORS.labels("tavily").inc()
         error_message = f"Tavily request failed: {exc}"
         _write_log(f"ERROR query={query!r} msg={error_message}")
         return _format_error(error_message)
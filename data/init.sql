@@ -11,14 +11,53 @@ CREATE TABLE IF NOT EXISTS news_items (
     description TEXT,
     published_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE,
-    kind VARCHAR(50)
+    kind VARCHAR(50),
+    ingested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()  -- start of the inserting transaction
 );
 
+-- Databases created before ingested_at existed (existing rows get the migration time)
+ALTER TABLE news_items ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_news_external_id ON news_items(external_id);
 CREATE INDEX IF NOT EXISTS idx_news_published_at ON news_items(published_at);
 CREATE INDEX IF NOT EXISTS idx_news_created_at ON news_items(created_at);
 CREATE INDEX IF NOT EXISTS idx_news_kind ON news_items(kind);
+-- Incremental Parquet exports select by ingestion time
+CREATE INDEX IF NOT EXISTS idx_news_ingested_at ON news_items(ingested_at);
+
+-- One row per successful ingest (save_to_database), so every app worker and
+-- restart reports the same last-ingestion time
+CREATE TABLE IF NOT EXISTS ingest_runs (
+    id SERIAL PRIMARY KEY,
+    ingested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    items_fetched INTEGER NOT NULL,
+    items_saved INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingest_runs_ingested_at ON ingest_runs(ingested_at);
+
+-- -------------------------------------------------------------
+-- Currency tags (CryptoPanic instruments per post)
+-- -------------------------------------------------------------
+
+-- Small integer ids for currency codes (BTC, ETH, ...)
+CREATE TABLE IF NOT EXISTS assets (
+    id SMALLSERIAL PRIMARY KEY,
+    code VARCHAR(20) UNIQUE NOT NULL
+);
+
+-- Many-to-many mapping; published_at is copied from news_items so per-asset
+-- time range queries are answered from the composite index alone
+CREATE TABLE IF NOT EXISTS news_item_assets (
+    news_item_id INTEGER NOT NULL REFERENCES news_items(id) ON DELETE CASCADE,
+    asset_id SMALLINT NOT NULL REFERENCES assets(id),
+    published_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (news_item_id, asset_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_assets_asset_published
+ON news_item_assets(asset_id, published_at DESC);
 
 -- Create a simple view for easy querying
 CREATE OR REPLACE VIEW recent_news AS
@@ -56,9 +95,13 @@ CREATE TABLE IF NOT EXISTS fear_and_greed_index (
     id SERIAL PRIMARY KEY,
     timestamp_utc TIMESTAMP WITH TIME ZONE NOT NULL,         -- 00:00 UTC daily timestamp from API
     value SMALLINT NOT NULL CHECK (value BETWEEN 0 AND 100), -- Fear & Greed numeric score (0–100)
-    value_classification fng_classification NOT NULL         -- Category derived from value range
+    value_classification fng_classification NOT NULL,        -- Category derived from value range
+    ingested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now() -- start of the inserting transaction
 );
 
+ALTER TABLE fear_and_greed_index ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+CREATE INDEX IF NOT EXISTS idx_fng_ingested_at ON fear_and_greed_index(ingested_at);
+
 -- Prevent duplicate entries for the same day
 CREATE UNIQUE INDEX IF NOT EXISTS idx_fng_timestamp_utc
 ON fear_and_greed_index(timestamp_utc);
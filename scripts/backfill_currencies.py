@@ -0,0 +1,66 @@
+"""Backfill news_item_assets from archived CryptoPanic responses.
+
+Reads one or more raw JSON archives ({"results": [...]} as written by
+/api/v1/fetch, or a bare list of posts), matches posts to news_items by
+external_id and records their currencies. Safe to re-run.
+
+Usage:
+    python -m scripts.backfill_currencies [data/crypto_news_data.json ...]
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from app.database import currency_codes, ensure_assets, get_db_connection, tag_news_item
+
+DEFAULT_ARCHIVE = Path(__file__).resolve().parents[1] / "data" / "crypto_news_data.json"
+BATCH_SIZE = 1000
+
+
+def load_archive(path: Path) -> dict:
+    """Map external_id -> currency codes for every tagged post in one archive file."""
+    with path.open(encoding="utf-8") as handle:
+        data = json.load(handle)
+    posts = data.get("results", []) if isinstance(data, dict) else data
+    return {post["id"]: codes for post in posts if post.get("id") and (codes := currency_codes(post))}
+
+
+def main(paths: list) -> int:
+    load_dotenv()
+    tags = {}
+    for path in paths:
+        if not path.exists():
+            print(f"⚠️ Skipping missing archive {path}")
+            continue
+        tags.update(load_archive(path))
+    if not tags:
+        print("No tagged posts found in the archives.")
+        return 0
+
+    conn = get_db_connection()
+    ensure_assets(conn, {code for codes in tags.values() for code in codes})
+
+    external_ids = list(tags)
+    tagged = 0
+    with conn.cursor() as cur:
+        for offset in range(0, len(external_ids), BATCH_SIZE):
+            batch = external_ids[offset:offset + BATCH_SIZE]
+            cur.execute(
+                "SELECT id, external_id, published_at FROM news_items WHERE external_id = ANY(%s);",
+                (batch,),
+            )
+            for news_item_id, external_id, published_at in cur.fetchall():
+                tag_news_item(cur, news_item_id, published_at, tags[external_id])
+                tagged += 1
+            conn.commit()
+    conn.close()
+
+    print(f"✅ Tagged {tagged}/{len(tags)} archived posts found in news_items")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main([Path(arg) for arg in sys.argv[1:]] or [DEFAULT_ARCHIVE]))
@@ -0,0 +1,111 @@
+"""Measure time-to-prompt of the agent CLI.
+
+Starts `python -m scripts.openai_comm` repeatedly and times how long it takes
+until "User: " is printed, then runs it once more under `-X importtime` and lists
+the heaviest imports that happened before the prompt. No request is ever sent to
+OpenAI (a placeholder OPENAI_API_KEY is used when none is set).
+
+Usage:
+    python -m scripts.benchmarks.cli_startup [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.benchmarks.common import REPO_ROOT, report_header, write_report
+
+PROMPT = b"User: "
+
+
+def _cli_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark-placeholder")
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def time_to_prompt(extra_args=(), stderr=subprocess.DEVNULL, timeout: float = 60.0) -> float:
+    """Seconds from process start until the CLI prints its first prompt."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *extra_args, "-m", "scripts.openai_comm"],
+        cwd=REPO_ROOT,
+        env=_cli_env(),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+    )
+    try:
+        seen = b""
+        while PROMPT not in seen:
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("CLI exited before showing the prompt")
+            seen += chunk
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError("CLI did not show the prompt in time")
+        return time.perf_counter() - started
+    finally:
+        process.kill()
+        process.wait()
+
+
+def heaviest_imports(limit: int) -> list:
+    """Top imports by cumulative time (microseconds) recorded before the prompt."""
+    with tempfile.TemporaryFile() as log:
+        time_to_prompt(("-X", "importtime"), stderr=log)
+        log.seek(0)
+        lines = log.read().decode("utf-8", "replace").splitlines()
+
+    top_level = []
+    for line in lines:
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # One leading space marks an import made directly by the CLI; nested ones are indented further.
+        if name[1:].startswith(" "):
+            continue
+        top_level.append({"module": name.strip(), "cumulative_us": int(cumulative_us), "self_us": int(self_us)})
+    return sorted(top_level, key=lambda entry: entry["cumulative_us"], reverse=True)[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark agent CLI time-to-prompt")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports to list")
+    parser.add_argument("--output", help="report path (default bench_results/cli_startup-<commit>.json)")
+    args = parser.parse_args()
+
+    samples = [time_to_prompt() for _ in range(args.runs)]
+    imports = heaviest_imports(args.top)
+
+    report = {
+        "name": "cli_startup",
+        **report_header(),
+        "time_to_prompt_ms": {
+            "runs": args.runs,
+            "min": round(min(samples) * 1000, 1),
+            "median": round(statistics.median(samples) * 1000, 1),
+            "max": round(max(samples) * 1000, 1),
+        },
+        "heaviest_imports": imports,
+    }
+    print(f"time to prompt: median {report['time_to_prompt_ms']['median']} ms "
+          f"(min {report['time_to_prompt_ms']['min']} ms over {args.runs} runs)")
+    for entry in imports:
+        print(f"  {entry['cumulative_us'] / 1000:8.1f} ms  {entry['module']}")
+
+    path = write_report(report, Path(args.output) if args.output else None)
+    print(f"Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
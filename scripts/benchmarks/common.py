@@ -0,0 +1,203 @@
+"""Shared helpers for the offline benchmark suite.
+
+Everything here talks to a local Postgres only. The suite uses its own database
+(BENCH_POSTGRES_DB, default crypto_news_bench) so seeding never touches real data.
+"""
+
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import psycopg2
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+INIT_SQL = REPO_ROOT / "data" / "init.sql"
+RESULTS_DIR = REPO_ROOT / "bench_results"
+
+BENCH_DB = os.getenv("BENCH_POSTGRES_DB", "crypto_news_bench")
+BENCH_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SEED_CHUNK_ROWS = 50_000
+
+_WORDS = (
+    "bitcoin ethereum etf rally selloff whale exchange regulator sec stablecoin defi "
+    "layer2 upgrade halving miners liquidity futures options treasury solana ripple "
+    "lawsuit hack bridge token airdrop staking inflow outflow record support resistance"
+).split()
+
+# Ordered roughly by how often CryptoPanic tags them; synthetic posts pick from the head more often.
+BENCH_CURRENCIES = (
+    "BTC ETH SOL XRP USDT BNB DOGE ADA TRX LINK AVAX DOT TON MATIC LTC SHIB BCH UNI ATOM XLM "
+    "ETC FIL APT ARB OP NEAR ICP HBAR VET INJ SUI SEI TIA PEPE WIF RNDR GRT AAVE MKR LDO "
+    "RUNE FTM ALGO EGLD SAND MANA AXS XTZ EOS KAS"
+).split()
+
+
+def db_settings(dbname: Optional[str] = None) -> Dict[str, str]:
+    """Connection settings for the bench database, reusing the app's POSTGRES_* variables."""
+    return {
+        "host": os.getenv("POSTGRES_HOST", "localhost"),
+        "port": os.getenv("POSTGRES_PORT", "5432"),
+        "dbname": dbname or BENCH_DB,
+        "user": os.getenv("POSTGRES_USER", "crypto_user"),
+        "password": os.getenv("POSTGRES_PASSWORD", "crypto_password"),
+    }
+
+
+def app_env() -> Dict[str, str]:
+    """Environment for app code (in-process or subprocess) pointed at the bench database."""
+    settings = db_settings()
+    env = dict(os.environ)
+    env.update(
+        POSTGRES_HOST=settings["host"],
+        POSTGRES_PORT=str(settings["port"]),
+        POSTGRES_DB=settings["dbname"],
+        POSTGRES_USER=settings["user"],
+        POSTGRES_PASSWORD=settings["password"],
+    )
+    return env
+
+
+def ensure_bench_database() -> None:
+    """Create the bench database if it does not exist yet."""
+    conn = psycopg2.connect(**db_settings("postgres"))
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s;", (BENCH_DB,))
+        if cur.fetchone() is None:
+            cur.execute(f"CREATE DATABASE \"{BENCH_DB}\" ENCODING 'UTF8' TEMPLATE template0;")
+    conn.close()
+
+
+def connect():
+    return psycopg2.connect(**db_settings())
+
+
+def reset_schema(conn) -> None:
+    """Drop the app tables and recreate them from data/init.sql."""
+    with conn.cursor() as cur:
+        cur.execute("DROP VIEW IF EXISTS recent_news, recent_fear_and_greed;")
+        cur.execute(
+            "DROP TABLE IF EXISTS news_item_assets, assets, news_items, ingest_runs, fear_and_greed_index CASCADE;"
+        )
+        cur.execute(INIT_SQL.read_text(encoding="utf-8"))
+    conn.commit()
+
+
+def synthetic_news(count: int, seed: int = 42, start_id: int = 1) -> Iterator[dict]:
+    """Deterministic CryptoPanic-shaped posts spread over the year after BENCH_EPOCH."""
+    rng = random.Random(seed)
+    span_seconds = 365 * 24 * 3600
+    for offset in range(count):
+        external_id = start_id + offset
+        published = BENCH_EPOCH + timedelta(seconds=rng.randrange(span_seconds))
+        title = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 12))).capitalize()
+        yield {
+            "id": external_id,
+            "slug": f"{title[:40].lower().replace(' ', '-')}-{external_id}",
+            "title": title,
+            "description": " ".join(rng.choice(_WORDS) for _ in range(rng.randint(20, 60))),
+            "published_at": published.isoformat(),
+            "created_at": (published + timedelta(seconds=rng.randint(1, 600))).isoformat(),
+            "kind": "news" if rng.random() < 0.85 else "media",
+            "instruments": [
+                {"code": code}
+                for code in {
+                    BENCH_CURRENCIES[int(len(BENCH_CURRENCIES) * rng.random() ** 2)]
+                    for _ in range(rng.randint(1, 3))
+                }
+            ],
+        }
+
+
+def _copy_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", " ").replace("\n", " ")
+
+
+def seed_news(conn, count: int, seed: int = 42) -> None:
+    """Bulk-load `count` synthetic rows with COPY, one bounded chunk at a time."""
+    columns = ("external_id", "slug", "title", "description", "published_at", "created_at", "kind")
+    rows = synthetic_news(count, seed)
+    with conn.cursor() as cur:
+        while True:
+            buffer = io.StringIO()
+            written = 0
+            for item in rows:
+                buffer.write(
+                    "\t".join(
+                        _copy_escape(str(item[key]))
+                        for key in ("id", "slug", "title", "description", "published_at", "created_at", "kind")
+                    )
+                )
+                buffer.write("\n")
+                written += 1
+                if written >= SEED_CHUNK_ROWS:
+                    break
+            if not written:
+                break
+            buffer.seek(0)
+            cur.copy_expert(f"COPY news_items ({', '.join(columns)}) FROM STDIN", buffer)
+        cur.execute("ANALYZE news_items;")
+    conn.commit()
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, math.ceil(pct * len(sorted_samples) / 100) - 1))
+    return sorted_samples[rank]
+
+
+def latency_summary(samples: Iterable[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max in milliseconds from samples in seconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def report_header() -> dict:
+    return {
+        "commit": git_commit(),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+def write_report(report: dict, path: Optional[Path] = None) -> Path:
+    """Write the JSON report (sorted keys so two runs diff cleanly)."""
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{report['name']}-{report['commit']}.json"
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
@@ -0,0 +1,55 @@
+"""Diff two benchmark reports written by the suite.
+
+Walks both JSON reports and prints every numeric leaf whose value changed, with the
+relative delta, so regressions between commits stand out.
+
+Usage:
+    python -m scripts.benchmarks.compare bench_results/suite-abc123.json bench_results/suite-def456.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict
+
+
+def _flatten(node, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    if isinstance(node, dict):
+        for key, value in node.items():
+            flat.update(_flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        flat[prefix] = float(node)
+    return flat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--only", default="", help="substring filter on metric paths, e.g. p99_ms")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as handle:
+        old = json.load(handle)
+    with open(args.new, encoding="utf-8") as handle:
+        new = json.load(handle)
+
+    print(f"{old.get('commit', '?')} -> {new.get('commit', '?')}")
+    old_flat, new_flat = _flatten(old), _flatten(new)
+    for key in sorted(set(old_flat) | set(new_flat)):
+        if args.only and args.only not in key:
+            continue
+        before, after = old_flat.get(key), new_flat.get(key)
+        if before == after:
+            continue
+        if before is None or after is None:
+            print(f"{key:70} {before!s:>12} -> {after!s:>12}")
+            continue
+        delta = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{key:70} {before:12.3f} -> {after:12.3f}  {delta}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Benchmark per-asset range queries on a large synthetic dataset.
+
+Seeds news_items with --rows synthetic posts (COPY), tags every row with one to
+three currencies skewed towards the popular ones (computed in SQL from the row id
+so seeding stays fast and deterministic), then times get_news_rows(currency=...)
+for popular and rare assets over day/week/month windows. As a reference it also
+times the same query filtered on news_items.published_at instead of the copied
+column, i.e. what the mapping table would cost without the composite index.
+
+Usage:
+    python -m scripts.benchmarks.currency_queries --rows 2000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from scripts.benchmarks.common import (
+    BENCH_CURRENCIES,
+    BENCH_EPOCH,
+    app_env,
+    connect,
+    ensure_bench_database,
+    latency_summary,
+    report_header,
+    reset_schema,
+    seed_news,
+    write_report,
+)
+
+WINDOWS = {"day": timedelta(days=1), "week": timedelta(days=7), "month": timedelta(days=30)}
+PROBE_ASSETS = ("BTC", "ETH", "LINK", "KAS")
+
+# Same skew as synthetic_news: index = floor(n * u^2) with u derived from the row id.
+_TAG_SQL = """
+    INSERT INTO assets (code) SELECT unnest(%(codes)s::text[]) ORDER BY 1;
+    INSERT INTO news_item_assets (news_item_id, asset_id, published_at)
+    SELECT DISTINCT n.id, a.id, n.published_at
+    FROM news_items n
+    CROSS JOIN LATERAL generate_series(1, 1 + (n.id %% 3)) AS slot
+    JOIN assets a ON a.code = (%(codes)s::text[])[
+        1 + floor(%(count)s * power(((n.id::bigint * 2654435761 + slot * 40503) %% 1000003) / 1000003.0, 2))::int
+    ];
+    ANALYZE assets;
+    ANALYZE news_item_assets;
+"""
+
+_REFERENCE_SQL = """
+    SELECT n.external_id, n.title, n.published_at
+    FROM news_item_assets na
+    JOIN news_items n ON n.id = na.news_item_id
+    WHERE na.asset_id = (SELECT id FROM assets WHERE code = %s)
+      AND n.published_at >= %s AND n.published_at <= %s
+    ORDER BY n.published_at DESC LIMIT 100;
+"""
+
+
+def seed(rows: int, seed_value: int) -> float:
+    started = time.perf_counter()
+    conn = connect()
+    reset_schema(conn)
+    seed_news(conn, rows, seed=seed_value)
+    with conn.cursor() as cur:
+        cur.execute(_TAG_SQL, {"codes": list(BENCH_CURRENCIES), "count": len(BENCH_CURRENCIES)})
+    conn.commit()
+    conn.close()
+    return time.perf_counter() - started
+
+
+def _time_calls(func, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return latency_summary(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-asset news range queries")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the data already in the bench DB")
+    parser.add_argument("--output", help="report path (default bench_results/currency_queries-<commit>.json)")
+    args = parser.parse_args()
+
+    ensure_bench_database()
+    report = {"name": "currency_queries", **report_header(), "rows": args.rows, "queries": {}}
+    if not args.skip_seed:
+        print(f"Seeding {args.rows} rows and currency tags...")
+        report["seed_s"] = round(seed(args.rows, args.seed), 3)
+
+    os.environ.update(app_env())
+    from app.database import get_news_rows
+
+    conn = connect()
+    end = BENCH_EPOCH + timedelta(days=200)
+    print(f"{'asset':>6} {'window':>6} {'rows':>5} {'p50 ms':>8} {'p99 ms':>8} {'ref p50':>8}")
+    for code in PROBE_ASSETS:
+        for window_name, window in WINDOWS.items():
+            start_iso, end_iso = (end - window).isoformat(), end.isoformat()
+            result_rows = len(get_news_rows(start_iso, end_iso, code))
+            indexed = _time_calls(lambda: get_news_rows(start_iso, end_iso, code), args.repeat)
+
+            def reference():
+                with conn.cursor() as cur:
+                    cur.execute(_REFERENCE_SQL, (code, start_iso, end_iso))
+                    cur.fetchall()
+
+            baseline = _time_calls(reference, args.repeat)
+            report["queries"][f"{code}.{window_name}"] = {
+                "rows": result_rows,
+                "indexed": indexed,
+                "reference": baseline,
+            }
+            print(
+                f"{code:>6} {window_name:>6} {result_rows:>5} {indexed['p50_ms']:>8.3f} "
+                f"{indexed['p99_ms']:>8.3f} {baseline['p50_ms']:>8.3f}"
+            )
+    conn.close()
+
+    path = write_report(report, Path(args.output) if args.output else None)
+    print(f"Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""Compare bulk export paths on a large synthetic news_items table.
+
+Seeds the bench database (default 1M news rows plus daily fear and greed values),
+then measures:
+- parquet: `python -m scripts.export_parquet` in a subprocess (wall time, peak RSS,
+  rows read back with pyarrow), followed by a second, incremental run with nothing new
+- arrow_stream: GET /api/v1/export/news read with pyarrow.ipc.open_stream
+- json_paging: walking /api/v1/news backwards 100 rows at a time, the only way to pull
+  history through the JSON API. Capped at --json-pages and extrapolated to the table size.
+Server peak RSS (VmHWM) is recorded around the API scenarios.
+
+Usage:
+    python -m scripts.benchmarks.export [--rows 1000000] [--json-pages 300]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import requests
+
+from scripts.benchmarks.common import (
+    REPO_ROOT,
+    app_env,
+    connect,
+    ensure_bench_database,
+    report_header,
+    reset_schema,
+    seed_news,
+    write_report,
+)
+from scripts.benchmarks.suite import _start_app
+
+
+def seed_fear_and_greed(conn, days: int = 3000) -> None:
+    """One synthetic index value per day, ending at the news epoch's year end."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO fear_and_greed_index (timestamp_utc, value, value_classification)
+            SELECT ts, v, (CASE WHEN v < 25 THEN 'Extreme Fear' WHEN v < 45 THEN 'Fear'
+                                WHEN v < 55 THEN 'Neutral' WHEN v < 75 THEN 'Greed'
+                                ELSE 'Extreme Greed' END)::fng_classification
+            FROM (
+                SELECT ts, (abs(hashtext(ts::text)) %% 101)::smallint AS v
+                FROM generate_series(TIMESTAMPTZ '2026-01-01' - make_interval(days => %s),
+                                     TIMESTAMPTZ '2025-12-31', INTERVAL '1 day') AS ts
+            ) AS days;
+            """,
+            (days,),
+        )
+    conn.commit()
+
+
+def _peak_rss_mb(pid: int) -> float:
+    """Peak resident set size of a running process (Linux VmHWM)."""
+    with open(f"/proc/{pid}/status", encoding="utf-8") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    return 0.0
+
+
+def _run_export(output: Path) -> dict:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        # No safety lag: the freshly seeded rows must be exported right away.
+        [sys.executable, "-m", "scripts.export_parquet", "--output", str(output), "--safety-lag", "0"],
+        cwd=REPO_ROOT,
+        env=app_env(),
+        stdout=subprocess.DEVNULL,
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"export_parquet exited with {process.returncode}")
+    return {"seconds": round(elapsed, 3), "peak_rss_mb": round(usage.ru_maxrss / 1024, 1)}
+
+
+def bench_parquet(rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp)
+        full = _run_export(output)
+        read_back = ds.dataset(output / "news", format="parquet", partitioning="hive").count_rows()
+        if read_back != rows:
+            raise RuntimeError(f"Parquet export holds {read_back} news rows, expected {rows}")
+        size_mb = sum(path.stat().st_size for path in output.rglob("*.parquet")) / 2**20
+        incremental = _run_export(output)
+        partitions = len(list((output / "news").iterdir()))
+    return {
+        **full,
+        "rows_per_s": round(rows / full["seconds"]),
+        "news_partitions": partitions,
+        "size_mb": round(size_mb, 1),
+        "incremental_noop": incremental,
+    }
+
+
+def bench_arrow_stream(base_url: str, rows: int) -> dict:
+    started = time.perf_counter()
+    with requests.get(f"{base_url}/api/v1/export/news", stream=True, timeout=600) as response:
+        response.raise_for_status()
+        reader = pa.ipc.open_stream(response.raw)
+        received = sum(batch.num_rows for batch in reader)
+    elapsed = time.perf_counter() - started
+    if received != rows:
+        raise RuntimeError(f"Arrow stream returned {received} rows, expected {rows}")
+    return {"seconds": round(elapsed, 3), "rows_per_s": round(rows / elapsed)}
+
+
+def bench_json_paging(base_url: str, rows: int, max_pages: int) -> dict:
+    """Walk /api/v1/news from the newest row backwards using `end` as the cursor."""
+    session = requests.Session()
+    seen = set()
+    end = None
+    pages = 0
+    started = time.perf_counter()
+    while pages < max_pages:
+        params = {"end": end} if end else {}
+        data = session.get(f"{base_url}/api/v1/news", params=params, timeout=30).json()["data"]
+        pages += 1
+        new_ids = {item["id"] for item in data} - seen
+        if not data:
+            break
+        seen |= new_ids
+        oldest = datetime.fromisoformat(data[-1]["published_at"])
+        # `end` is inclusive at second resolution: step back a second once a page adds nothing new.
+        if not new_ids:
+            oldest -= timedelta(seconds=1)
+        end = oldest.strftime("%Y-%m-%dT%H:%M:%S")
+    elapsed = time.perf_counter() - started
+    rows_per_s = len(seen) / elapsed
+    return {
+        "pages": pages,
+        "rows": len(seen),
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(rows_per_s),
+        "extrapolated_full_s": round(rows / rows_per_s, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="news_items rows to seed")
+    parser.add_argument("--json-pages", type=int, default=300, help="JSON API pages to time before extrapolating")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the rows already in the bench database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="report path (default bench_results/export-<commit>.json)")
+    args = parser.parse_args()
+
+    ensure_bench_database()
+    if not args.skip_seed:
+        print(f"Seeding {args.rows} rows...")
+        conn = connect()
+        reset_schema(conn)
+        seed_news(conn, args.rows, seed=args.seed)
+        seed_fear_and_greed(conn)
+        conn.close()
+
+    report = {
+        "name": "export",
+        **report_header(),
+        "config": {"rows": args.rows, "json_pages": args.json_pages, "seed": args.seed},
+    }
+
+    print("Running Parquet export...")
+    report["parquet"] = bench_parquet(args.rows)
+
+    process, base_url = _start_app(app_env())
+    try:
+        baseline_rss = _peak_rss_mb(process.pid)
+        print("Paging through the JSON API...")
+        report["json_paging"] = bench_json_paging(base_url, args.rows, args.json_pages)
+        report["json_paging"]["server_peak_rss_mb"] = _peak_rss_mb(process.pid)
+        print("Reading the Arrow IPC stream...")
+        report["arrow_stream"] = bench_arrow_stream(base_url, args.rows)
+        report["arrow_stream"]["server_peak_rss_mb"] = _peak_rss_mb(process.pid)
+        report["server_baseline_rss_mb"] = baseline_rss
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    json_rate = report["json_paging"]["rows_per_s"]
+    report["speedup_vs_json"] = {
+        "parquet": round(report["parquet"]["rows_per_s"] / json_rate, 1),
+        "arrow_stream": round(report["arrow_stream"]["rows_per_s"] / json_rate, 1),
+    }
+
+    print(f"parquet:      {report['parquet']['seconds']:8.1f} s  "
+          f"({report['parquet']['rows_per_s']} rows/s, peak RSS {report['parquet']['peak_rss_mb']} MB)")
+    print(f"arrow stream: {report['arrow_stream']['seconds']:8.1f} s  "
+          f"({report['arrow_stream']['rows_per_s']} rows/s)")
+    print(f"json paging:  {report['json_paging']['extrapolated_full_s']:8.1f} s  "
+          f"({json_rate} rows/s, extrapolated from {report['json_paging']['rows']} rows)")
+
+    path = write_report(report, Path(args.output) if args.output else None)
+    print(f"Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
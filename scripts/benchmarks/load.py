@@ -0,0 +1,79 @@
+"""Open-loop HTTP load generator.
+
+Requests are scheduled at a fixed rate regardless of how fast earlier ones finish,
+and latency is measured from the scheduled send time, so a slow server shows up as
+queueing delay instead of silently lowering the offered load.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import requests
+
+from scripts.benchmarks.common import latency_summary
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+def run_load(
+    url: str,
+    rate: float,
+    duration: float,
+    method: str = "GET",
+    params: Optional[dict] = None,
+    json_body: Optional[dict] = None,
+    concurrency: int = 32,
+    timeout: float = 30.0,
+) -> Dict[str, object]:
+    """Fire `rate` requests per second at `url` for `duration` seconds and summarise them."""
+    total = max(1, int(rate * duration))
+    interval = 1.0 / rate
+    latencies = []
+    service_times = []
+    errors = {}
+    lock = threading.Lock()
+
+    def fire(scheduled: float) -> None:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        sent = time.perf_counter()
+        try:
+            response = _session().request(method, url, params=params, json=json_body, timeout=timeout)
+            ok = response.status_code < 400
+            key = str(response.status_code)
+        except requests.RequestException as exc:
+            ok = False
+            key = type(exc).__name__
+        done = time.perf_counter()
+        with lock:
+            if ok:
+                latencies.append(done - scheduled)
+                service_times.append(done - sent)
+            else:
+                errors[key] = errors.get(key, 0) + 1
+
+    start = time.perf_counter() + 0.05
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for index in range(total):
+            pool.submit(fire, start + index * interval)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "offered_rps": rate,
+        "duration_s": round(elapsed, 3),
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency": latency_summary(latencies),
+        "service_time": latency_summary(service_times),
+    }
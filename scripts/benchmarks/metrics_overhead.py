@@ -0,0 +1,72 @@
+"""Measure the hot-path cost of the Prometheus instrumentation.
+
+Runs fully in-process (no database, no network):
+- timed() around a no-op versus the bare no-op
+- an ASGI request through MetricsMiddleware versus the same app without it
+
+Usage:
+    python -m scripts.benchmarks.metrics_overhead
+"""
+
+import asyncio
+import time
+
+from app.metrics import STAGE_LATENCY, MetricsMiddleware, timed
+
+ITERATIONS = 200_000
+REQUESTS = 50_000
+
+
+def _per_call_ns(func, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    func(iterations)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def _bare(iterations: int) -> None:
+    for _ in range(iterations):
+        pass
+
+
+def _with_timed(iterations: int) -> None:
+    for _ in range(iterations):
+        with timed(STAGE_LATENCY, "bench.noop"):
+            pass
+
+
+class _Route:
+    path = "/bench"
+
+
+async def _plain_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _drive(app, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        return None
+
+    start = time.perf_counter_ns()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "GET", "path": "/bench", "app": None}
+        await app(scope, receive, send)
+    return (time.perf_counter_ns() - start) / requests
+
+
+def main() -> None:
+    bare = _per_call_ns(_bare, ITERATIONS)
+    with_timer = _per_call_ns(_with_timed, ITERATIONS)
+    print(f"timed() overhead:     {with_timer - bare:8.0f} ns/call")
+
+    plain = asyncio.run(_drive(_plain_app, REQUESTS))
+    wrapped = asyncio.run(_drive(MetricsMiddleware(_plain_app), REQUESTS))
+    print(f"middleware overhead:  {wrapped - plain:8.0f} ns/request")
+
+
+if __name__ == "__main__":
+    main()
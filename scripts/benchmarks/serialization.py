@@ -0,0 +1,116 @@
+"""Compare the old and new /api/v1/news encoding paths in-process (no database).
+
+old: datetime rows -> dicts with .isoformat() -> NewsItem models ->
+     FastAPI response_model validation -> jsonable_encoder -> json.dumps
+new: string rows (timestamps formatted in SQL) -> dict(zip()) -> orjson
+
+Usage:
+    python -m scripts.benchmarks.serialization [--sizes 100,1000,10000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.database import NEWS_FIELDS
+from app.models import NewsItem, NewsQueryResponse
+from scripts.benchmarks.common import report_header, synthetic_news, write_report
+
+_RESPONSE_FIELD = create_response_field(name="Response_get_news", type_=NewsQueryResponse)
+# One loop for every old-path call, so loop setup is not charged to the old path.
+_LOOP = asyncio.new_event_loop()
+
+
+def _db_rows(count: int) -> tuple[list, list]:
+    """Rows as psycopg2 would return them for the old (datetime) and new (SQL-formatted) queries."""
+    old_rows, new_rows = [], []
+    for item in synthetic_news(count):
+        published = datetime.fromisoformat(item["published_at"])
+        created = datetime.fromisoformat(item["created_at"])
+        old_rows.append({**item, "published_at": published, "created_at": created})
+        new_rows.append(
+            (
+                item["id"], item["slug"], item["title"], item["description"],
+                published.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                created.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                item["kind"],
+            )
+        )
+    return old_rows, new_rows
+
+
+def old_path(rows: list) -> bytes:
+    news_items = []
+    for row in rows:
+        news_items.append({
+            "id": row["id"],
+            "slug": row["slug"],
+            "title": row["title"],
+            "description": row["description"],
+            "published_at": row["published_at"].isoformat() if row["published_at"] else "",
+            "created_at": row["created_at"].isoformat() if row["created_at"] else "",
+            "kind": row["kind"],
+        })
+    response = NewsQueryResponse(
+        success=True,
+        message="News items retrieved from database",
+        items_retrieved=len(news_items),
+        data=[NewsItem(**item) for item in news_items],
+    )
+    content = _LOOP.run_until_complete(
+        serialize_response(field=_RESPONSE_FIELD, response_content=response, is_coroutine=True)
+    )
+    return JSONResponse(content).body
+
+
+def new_path(rows: list) -> bytes:
+    return ORJSONResponse({
+        "success": True,
+        "message": "News items retrieved from database",
+        "items_retrieved": len(rows),
+        "data": [dict(zip(NEWS_FIELDS, row)) for row in rows],
+    }).body
+
+
+def _best_of(func, rows, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark /api/v1/news serialization")
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="report path (default bench_results/serialization-<commit>.json)")
+    args = parser.parse_args()
+
+    report = {"name": "serialization", **report_header(), "sizes": {}}
+    print(f"{'items':>8} {'old ms':>10} {'new ms':>10} {'speedup':>8}")
+    for size in (int(value) for value in args.sizes.split(",") if value):
+        old_rows, new_rows = _db_rows(size)
+        old_s = _best_of(old_path, old_rows, args.repeat)
+        new_s = _best_of(new_path, new_rows, args.repeat)
+        report["sizes"][str(size)] = {
+            "old_ms": round(old_s * 1000, 3),
+            "new_ms": round(new_s * 1000, 3),
+            "speedup": round(old_s / new_s, 2),
+        }
+        print(f"{size:>8} {old_s * 1000:>10.3f} {new_s * 1000:>10.3f} {old_s / new_s:>7.1f}x")
+
+    write_report(report, Path(args.output) if args.output else None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Local stand-in for the CryptoPanic posts endpoint.
+
+Each request returns a page of deterministic posts. Consecutive pages overlap by
+`overlap` items so ingestion sees a realistic mix of new rows and duplicates.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+from scripts.benchmarks.common import synthetic_news
+
+# Start well above the seeded id range so replayed posts never collide with seed rows.
+STUB_ID_OFFSET = 1_000_000_000
+
+
+class _StubState:
+    def __init__(self, page_size: int, overlap: int):
+        self.page_size = page_size
+        self.overlap = overlap
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def next_page(self) -> list:
+        with self.lock:
+            call = self.calls
+            self.calls += 1
+        step = self.page_size - self.overlap
+        start_id = STUB_ID_OFFSET + call * step
+        return list(synthetic_news(self.page_size, seed=start_id, start_id=start_id))
+
+
+def start_stub(page_size: int = 50, overlap: int = 10) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve stub pages on an ephemeral localhost port; returns (server, posts URL)."""
+    state = _StubState(page_size, overlap)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({"results": state.next_page()}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, name="cryptopanic-stub", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/developer/v2/posts/"
@@ -0,0 +1,174 @@
+"""Reproducible, offline benchmark suite for the API and ingestion.
+
+For each dataset size the suite reseeds the bench database with synthetic
+news_items, starts the FastAPI app under uvicorn on a free local port, drives the
+read endpoints at fixed request rates, then replays ingestion against a stub
+CryptoPanic server. Results go to bench_results/suite-<commit>.json; compare two
+runs with `python -m scripts.benchmarks.compare OLD NEW`.
+
+Requires only a local Postgres reachable with the usual POSTGRES_* variables.
+
+Usage:
+    python -m scripts.benchmarks.suite --sizes 1000,100000 --rates 50,200 --duration 10
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+from scripts.benchmarks.common import (
+    REPO_ROOT,
+    app_env,
+    connect,
+    ensure_bench_database,
+    latency_summary,
+    report_header,
+    reset_schema,
+    seed_news,
+    write_report,
+)
+from scripts.benchmarks.load import run_load
+from scripts.benchmarks.stub_cryptopanic import start_stub
+
+# Read scenarios driven against every dataset size: (name, method, path, params)
+READ_SCENARIOS = (
+    ("news_latest", "GET", "/api/v1/news", None),
+    ("news_week", "GET", "/api/v1/news", {"start": "2025-06-01T00:00:00", "end": "2025-06-07T23:59:59"}),
+    ("health", "GET", "/health", None),
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_app(env: dict) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health/ready", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API did not become ready within 30s")
+
+
+def bench_reads(base_url: str, rates: list, duration: float) -> dict:
+    results = {}
+    for name, method, path, params in READ_SCENARIOS:
+        # Warm connections and plans before measuring.
+        run_load(f"{base_url}{path}", rate=min(rates), duration=1, method=method, params=params)
+        results[name] = {
+            str(rate): run_load(f"{base_url}{path}", rate=rate, duration=duration, method=method, params=params)
+            for rate in rates
+        }
+    return results
+
+
+def bench_ingest(batches: int, page_size: int, overlap: int) -> dict:
+    """Replay CryptoPanic pages through fetch_crypto_news + save_to_database in-process."""
+    server, url = start_stub(page_size=page_size, overlap=overlap)
+    os.environ.update(app_env())
+    os.environ["CRYPTO_PANIC_API_URL"] = url
+    os.environ["CRYPTO_PANIC_API_KEY"] = "bench"
+
+    from app.crypto_api import fetch_crypto_news
+    from app.database import save_to_database
+
+    fetch_times, save_times = [], []
+    items = 0
+    started = time.perf_counter()
+    try:
+        for _ in range(batches):
+            t0 = time.perf_counter()
+            results = fetch_crypto_news("hot", "BTC,ETH", "news")
+            t1 = time.perf_counter()
+            if not save_to_database(results):
+                raise RuntimeError("save_to_database failed during ingest replay")
+            t2 = time.perf_counter()
+            fetch_times.append(t1 - t0)
+            save_times.append(t2 - t1)
+            items += len(results)
+    finally:
+        server.shutdown()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "batches": batches,
+        "page_size": page_size,
+        "overlap": overlap,
+        "items": items,
+        "items_per_s": round(items / elapsed, 1) if elapsed else 0.0,
+        "fetch": latency_summary(fetch_times),
+        "save": latency_summary(save_times),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated news_items row counts")
+    parser.add_argument("--rates", default="50,200", help="comma-separated offered request rates (req/s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per load step")
+    parser.add_argument("--ingest-batches", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--overlap", type=int, default=10, help="duplicate posts between consecutive pages")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="report path (default bench_results/suite-<commit>.json)")
+    args = parser.parse_args()
+
+    sizes = [int(value) for value in args.sizes.split(",") if value]
+    rates = [float(value) for value in args.rates.split(",") if value]
+
+    ensure_bench_database()
+    report = {
+        "name": "suite",
+        **report_header(),
+        "config": {"sizes": sizes, "rates": rates, "duration_s": args.duration, "seed": args.seed},
+        "sizes": {},
+    }
+
+    for size in sizes:
+        print(f"Seeding {size} rows...")
+        conn = connect()
+        seed_started = time.perf_counter()
+        reset_schema(conn)
+        seed_news(conn, size, seed=args.seed)
+        conn.close()
+        entry = {"seed_s": round(time.perf_counter() - seed_started, 3)}
+
+        process, base_url = _start_app(app_env())
+        try:
+            print(f"Driving read endpoints at {rates} req/s...")
+            entry["reads"] = bench_reads(base_url, rates, args.duration)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+        print("Replaying ingestion against the stub CryptoPanic server...")
+        entry["ingest"] = bench_ingest(args.ingest_batches, args.page_size, args.overlap)
+        report["sizes"][str(size)] = entry
+
+    path = write_report(report, Path(args.output) if args.output else None)
+    print(f"Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
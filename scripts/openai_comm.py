@@ -1,19 +1,22 @@
-"""CLI loop that runs the Atlas agent with LangChain and OpenAI."""
+"""CLI loop that runs the Atlas agent with LangChain and OpenAI.
+
+LangChain, the OpenAI client and the tools are heavy to import, so they are loaded
+and wired up on a background thread while the user types the first prompt
+(set AGENT_WARMUP=0 to build them on first use instead).
+"""
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
-from langchain.agents import create_agent
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
-
-from app.prompts import system_prompt
-from app.tools import get_db_news, get_health, search_web
 
 
 def _build_search_summary(messages) -> str | None:
     """Return a short summary based on the newest search_web tool output."""
+    from langchain_core.messages import ToolMessage
+
     # Walk newest-to-oldest so we summarise the latest search.
     for message in reversed(messages):
         if not isinstance(message, ToolMessage) or getattr(message, "name", "") != "search_web":
@@ -61,111 +64,152 @@ def _build_search_summary(messages) -> str | None:
     return None
 
 
-load_dotenv()
-
-# Configure the chat model once so the agent can reuse it every turn.
-model = ChatOpenAI(
-    model="gpt-4o",
-    temperature=0.2,  # Keeps answers factual while still sounding natural.
-    max_tokens=800,  # Enough room for condensed bullet lists without runaway cost.
-    timeout=60,  # Gives tool-heavy turns a little breathing space.
-)
-
-# Wire up the agent with our tools and system prompt.
-agent = create_agent(
-    model,
-    tools=[get_health, get_db_news, search_web],
-    system_prompt=system_prompt,
-)
-
-messages = []
+def _build_agent():
+    """Import LangChain and the tools, then build the chat model and agent."""
+    from langchain.agents import create_agent
+    from langchain_openai import ChatOpenAI
+
+    from app.prompts import system_prompt
+    from app.tools import get_db_news, get_health, search_web
+
+    # Configure the chat model once so the agent can reuse it every turn.
+    model = ChatOpenAI(
+        model="gpt-4o",
+        temperature=0.2,  # Keeps answers factual while still sounding natural.
+        max_tokens=800,  # Enough room for condensed bullet lists without runaway cost.
+        timeout=60,  # Gives tool-heavy turns a little breathing space.
+    )
+
+    # Wire up the agent with our tools and system prompt.
+    return create_agent(
+        model,
+        tools=[get_health, get_db_news, search_web],
+        system_prompt=system_prompt,
+    )
+
+
+def _agent_loader():
+    """Return a callable yielding the agent; with warm-up on, building starts right away in the background."""
+    if os.getenv("AGENT_WARMUP", "1") == "0":
+        return _build_agent
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent-warmup")
+    future = executor.submit(_build_agent)
+    executor.shutdown(wait=False)
+    return future.result
+
+
+def main() -> None:
+    load_dotenv()
+
+    # Expose agent/tool latency histograms when METRICS_PORT is set.
+    if os.getenv("METRICS_PORT"):
+        from app.metrics import start_metrics_server
+
+        start_metrics_server()
+
+    load_agent = _agent_loader()
+    agent = None
+
+    messages = []
+
+    while True:
+        user_input = input("User: ")
+        if agent is None:
+            # Usually already finished while the user was typing.
+            agent = load_agent()
+            from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+
+            from app.metrics import STAGE_LATENCY, timed
+
+        messages.append(HumanMessage(content=user_input))
+        previous_length = len(messages)
+
+        token_logs = []
+        fallback_detected = False
+
+        for attempt in range(2):
+            # Ask the agent to handle the latest message list.
+            with timed(STAGE_LATENCY, "agent.invoke"):
+                result = agent.invoke({"messages": messages})
+            messages = result["messages"]
+            new_messages = messages[previous_length:]
+
+            total_prompt_tokens = 0
+            total_completion_tokens = 0
+            total_tokens = 0
+
+            # Aggregate token usage so we can log a single line per turn.
+            for msg in new_messages:
+                usage = getattr(msg, "response_metadata", {}).get("token_usage")
+                if not usage:
+                    continue
+                total_prompt_tokens += usage.get("prompt_tokens", 0)
+                total_completion_tokens += usage.get("completion_tokens", 0)
+                total_tokens += usage.get(
+                    "total_tokens",
+                    usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0),
+                )
 
-while True:
-    user_input = input("User: ")
-    messages.append(HumanMessage(content=user_input))
-    previous_length = len(messages)
+            token_logs.append(
+                {
+                    "prompt": total_prompt_tokens,
+                    "completion": total_completion_tokens,
+                    "total": total_tokens,
+                }
+            )
 
-    token_logs = []
-    fallback_detected = False
+            final_message = messages[-1]
+            used_search_web = any(
+                isinstance(msg, ToolMessage) and getattr(msg, "name", "") == "search_web"
+                for msg in new_messages
+            )
+            content_lower = final_message.content.strip().lower()
+            fallback_triggers = (
+                "no news found for that time period.",
+                "unable to access",
+                "can't access",
+                "cannot access",
+                "no web news",
+                "unable to retrieve",
+            )
+            fallback_response = any(trigger in content_lower for trigger in fallback_triggers)
+
+            if fallback_response and not used_search_web and attempt == 0:
+                # Nudge the agent if it tried to give up without searching.
+                messages.append(
+                    SystemMessage(
+                        content=(
+                            "You must call search_web with a focused query before concluding that no news exists. "
+                            "Call search_web now and then provide an updated answer to the user."
+                        )
+                    )
+                )
+                previous_length = len(messages)
+                continue
 
-    for attempt in range(2):
-        # Ask the agent to handle the latest message list.
-        result = agent.invoke({"messages": messages})
-        messages = result["messages"]
-        new_messages = messages[previous_length:]
+            fallback_detected = fallback_response
+            break
 
-        total_prompt_tokens = 0
-        total_completion_tokens = 0
-        total_tokens = 0
+        combined_prompt = sum(entry["prompt"] for entry in token_logs)
+        combined_completion = sum(entry["completion"] for entry in token_logs)
+        combined_total = sum(entry["total"] for entry in token_logs)
 
-        # Aggregate token usage so we can log a single line per turn.
-        for msg in new_messages:
-            usage = getattr(msg, "response_metadata", {}).get("token_usage")
-            if not usage:
-                continue
-            total_prompt_tokens += usage.get("prompt_tokens", 0)
-            total_completion_tokens += usage.get("completion_tokens", 0)
-            total_tokens += usage.get(
-                "total_tokens",
-                usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0),
+        if combined_total:
+            print(
+                f"[token usage] prompt={combined_prompt} completion={combined_completion} total={combined_total}"
             )
 
-        token_logs.append(
-            {
-                "prompt": total_prompt_tokens,
-                "completion": total_completion_tokens,
-                "total": total_tokens,
-            }
-        )
-
         final_message = messages[-1]
-        used_search_web = any(
-            isinstance(msg, ToolMessage) and getattr(msg, "name", "") == "search_web"
-            for msg in new_messages
-        )
-        content_lower = final_message.content.strip().lower()
-        fallback_triggers = (
-            "no news found for that time period.",
-            "unable to access",
-            "can't access",
-            "cannot access",
-            "no web news",
-            "unable to retrieve",
-        )
-        fallback_response = any(trigger in content_lower for trigger in fallback_triggers)
-
-        if fallback_response and not used_search_web and attempt == 0:
-            # Nudge the agent if it tried to give up without searching.
-            messages.append(
-                SystemMessage(
-                    content=(
-                        "You must call search_web with a focused query before concluding that no news exists. "
-                        "Call search_web now and then provide an updated answer to the user."
-                    )
-                )
-            )
-            previous_length = len(messages)
-            continue
-
-        fallback_detected = fallback_response
-        break
-
-    combined_prompt = sum(entry["prompt"] for entry in token_logs)
-    combined_completion = sum(entry["completion"] for entry in token_logs)
-    combined_total = sum(entry["total"] for entry in token_logs)
 
-    if combined_total:
-        print(
-            f"[token usage] prompt={combined_prompt} completion={combined_completion} total={combined_total}"
-        )
+        # If the model still produced a fallback, surface the raw search results instead.
+        if fallback_detected:
+            summary = _build_search_summary(messages)
+            if summary:
+                print(summary)
+                continue
 
-    final_message = messages[-1]
+        print(final_message.content)
 
-    # If the model still produced a fallback, surface the raw search results instead.
-    if fallback_detected:
-        summary = _build_search_summary(messages)
-        if summary:
-            print(summary)
-            continue
 
-    print(final_message.content)
+if __name__ == "__main__":
+    main()